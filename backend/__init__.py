@@ -7,6 +7,7 @@ from config.settings import config
 
 def create_app(test_config=None):
     """Application factory pattern for Flask app with enhanced security"""
+    logger = logging.getLogger(__name__)
     
     # Load environment variables FIRST, before any configuration
     load_dotenv()
@@ -24,7 +25,6 @@ def create_app(test_config=None):
         config[config_name].init_app(app)
         
         # Log configuration status
-        logger = logging.getLogger(__name__)
         logger.info(f"Flask app configured for {config_name} environment")
         
         # Validate required environment variables in production
@@ -37,10 +37,21 @@ def create_app(test_config=None):
         # Load the test config if passed in
         app.config.from_mapping(test_config)
     
+    # Serialize JSON responses with orjson
+    from utils.json_provider import OrjsonProvider
+    app.json = OrjsonProvider(app)
+    
     # Configure CORS with proper origins
     cors_origins = app.config.get('CORS_ORIGINS', ['http://localhost:3000'])
     CORS(app, origins=cors_origins)
 
+    # Compress JSON responses, preferring brotli over gzip
+    try:
+        from flask_compress import Compress
+        Compress(app)
+    except ImportError as e:
+        logger.warning("Response compression not available: %s", e)
+
     # Initialize database
     try:
         from models.database import init_db
@@ -1,5 +1,6 @@
 import os
 import logging
+import multiprocessing
 import re
 from typing import Optional, List
 
@@ -41,6 +42,22 @@ class Config:
     RATE_LIMIT_REQUESTS = int(os.environ.get('RATE_LIMIT_REQUESTS', '100'))
     RATE_LIMIT_WINDOW = int(os.environ.get('RATE_LIMIT_WINDOW', '3600'))  # 1 hour
     
+    # eBay API Call Quota Configuration
+    # The Finding API allows EBAY_DAILY_CALL_QUOTA calls per day per app ID. Each worker process
+    # enforces its own share, so the quota is split across the GUNICORN_WORKERS processes, and at
+    # most EBAY_QUOTA_BURST_SECONDS worth of calls can be made back to back
+    EBAY_DAILY_CALL_QUOTA = int(os.environ.get('EBAY_DAILY_CALL_QUOTA', '5000'))
+    EBAY_QUOTA_WORKERS = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count()))
+    EBAY_QUOTA_BURST_SECONDS = int(os.environ.get('EBAY_QUOTA_BURST_SECONDS', '300'))  # 5 minutes
+    
+    # Response Compression Configuration (Flask-Compress)
+    COMPRESS_ALGORITHM = ['br', 'gzip']
+    COMPRESS_MIMETYPES = ['application/json']
+    COMPRESS_MIN_SIZE = 500  # bytes; smaller bodies aren't worth compressing
+    COMPRESS_LEVEL = 4  # gzip level
+    COMPRESS_BR_LEVEL = 4  # brotli quality
+    COMPRESS_STREAMS = True  # also compress the streamed portfolio and saved-items listings
+    
     @classmethod
     def get_ebay_api_key(cls) -> Optional[str]:
         """Get eBay API key dynamically"""
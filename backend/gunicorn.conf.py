@@ -0,0 +1,21 @@
+"""
+Gunicorn configuration for FlipLens application
+"""
+
+import multiprocessing
+import os
+
+# Search requests spend most of their time waiting on the eBay API, so use cooperative
+# gevent workers: one worker can hold many requests in flight instead of blocking per call.
+# The gevent worker monkey-patches the stdlib (sockets used by requests/urllib3) before
+# the app is imported, so preload_app must stay off. Set GUNICORN_WORKER_CLASS=gthread
+# if a C database driver that gevent cannot patch (e.g. plain psycopg2) is in use.
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gevent')
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count()))
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 1000))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))  # only used by gthread workers
+preload_app = False
+
+bind = f"{os.environ.get('HOST', '127.0.0.1')}:{os.environ.get('PORT', 5000)}"
+timeout = 30
+graceful_timeout = 30
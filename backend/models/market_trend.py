@@ -76,25 +76,32 @@ class MarketTrend(db.Model):
             'created_at': self.created_at.isoformat() if self.created_at else None,
         }
     
+    @classmethod
+    def _filtered_query(cls, item_identifier, platform=None, condition=None, days_back=30):
+        """Build the base query for an item's price data within the time window"""
+        from datetime import timedelta
+        
+        cutoff_date = datetime.utcnow() - timedelta(days=days_back)
+        
+        query = cls.query.filter(
+            cls.item_identifier == item_identifier,
+            cls.recorded_at >= cutoff_date
+        )
+        
+        if platform:
+            query = query.filter(cls.platform == platform)
+        
+        if condition:
+            query = query.filter(cls.condition == condition)
+        
+        return query
+    
     @classmethod
     def get_price_trends(cls, item_identifier, platform=None, condition=None, 
                         days_back=30, limit=1000):
         """Get price trends for an item"""
         try:
-            from datetime import timedelta
-            
-            cutoff_date = datetime.utcnow() - timedelta(days=days_back)
-            
-            query = cls.query.filter(
-                cls.item_identifier == item_identifier,
-                cls.recorded_at >= cutoff_date
-            )
-            
-            if platform:
-                query = query.filter(cls.platform == platform)
-            
-            if condition:
-                query = query.filter(cls.condition == condition)
+            query = cls._filtered_query(item_identifier, platform, condition, days_back)
             
             trends = query.order_by(cls.recorded_at.asc()).limit(limit).all()
             
@@ -108,21 +115,9 @@ class MarketTrend(db.Model):
     def get_market_summary(cls, item_identifier, platform=None, condition=None, days_back=30):
         """Get market summary statistics"""
         try:
-            from datetime import timedelta
             from sqlalchemy import func
             
-            cutoff_date = datetime.utcnow() - timedelta(days=days_back)
-            
-            query = cls.query.filter(
-                cls.item_identifier == item_identifier,
-                cls.recorded_at >= cutoff_date
-            )
-            
-            if platform:
-                query = query.filter(cls.platform == platform)
-            
-            if condition:
-                query = query.filter(cls.condition == condition)
+            query = cls._filtered_query(item_identifier, platform, condition, days_back)
             
             # Calculate statistics
             stats = query.with_entities(
@@ -153,6 +148,34 @@ class MarketTrend(db.Model):
             logger.error(f"Failed to get market summary: {str(e)}")
             return None
     
+    @classmethod
+    def get_trends_and_summary(cls, item_identifier, platform=None, condition=None,
+                               days_back=30, limit=1000):
+        """Get price trends and market summary from a single query (None, None if the query fails)"""
+        try:
+            query = cls._filtered_query(item_identifier, platform, condition, days_back)
+            rows = query.order_by(cls.recorded_at.asc()).all()
+            
+            if not rows:
+                return [], None
+            
+            prices = sorted(float(row.price) for row in rows)
+            
+            summary = {
+                'average': sum(prices) / len(prices),
+                'median': prices[len(prices) // 2],
+                'lowest': prices[0],
+                'highest': prices[-1],
+                'count': len(prices),
+                'period_days': days_back
+            }
+            
+            return [row.to_dict() for row in rows[:limit]], summary
+            
+        except Exception as e:
+            logger.error(f"Failed to get trends and summary: {str(e)}")
+            return None, None
+    
     @classmethod
     def record_price_data(cls, item_identifier, platform, condition, price, **kwargs):
         """Record new price data point"""
@@ -4,6 +4,8 @@ Portfolio Item model for FlipLens application
 
 from datetime import datetime
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import case, and_
+import ciso8601
 import logging
 
 from .database import db
@@ -64,6 +66,12 @@ class PortfolioItem(db.Model):
     # Relationship
     user = db.relationship('User', backref='portfolio_items')
     
+    # Indexes backing the paginated portfolio listing (filter by user/status, newest first)
+    __table_args__ = (
+        db.Index('ix_pf_user_status_created', user_id, status, created_at.desc()),
+        db.Index('ix_pf_user_created', user_id, created_at.desc()),
+    )
+    
     def __init__(self, user_id, item_name, purchase_price, purchase_date, condition, **kwargs):
         self.user_id = user_id
         self.item_name = item_name
@@ -79,8 +87,9 @@ class PortfolioItem(db.Model):
     def __repr__(self):
         return f'<PortfolioItem {self.item_name} by User {self.user_id}>'
     
-    def calculate_fliplens_rating(self):
-        """Calculate FlipLens rating based on multiple factors"""
+    @staticmethod
+    def _rating_for(item):
+        """Calculate (rating, factors) for an item or a row with the same columns; factors is None on failure"""
         try:
             factors = {}
             total_score = 0
@@ -100,8 +109,8 @@ class PortfolioItem(db.Model):
             max_score += 10
             
             # Factor 3: Profit potential
-            if self.current_market_price and self.purchase_price:
-                profit_margin = (float(self.current_market_price) - float(self.purchase_price)) / float(self.purchase_price)
+            if item.current_market_price and item.purchase_price:
+                profit_margin = (float(item.current_market_price) - float(item.purchase_price)) / float(item.purchase_price)
                 profit_score = min(10, max(0, profit_margin * 20))  # 50% profit = 10 points
             else:
                 profit_score = 5.0  # Default if no market price
@@ -118,7 +127,7 @@ class PortfolioItem(db.Model):
                 'fair': 4,
                 'poor': 2
             }
-            condition_score = condition_scores.get(self.condition.lower(), 5)
+            condition_score = condition_scores.get(item.condition.lower(), 5)
             factors['condition'] = condition_score
             total_score += condition_score
             max_score += 10
@@ -132,7 +141,7 @@ class PortfolioItem(db.Model):
                 'gucci': 9,
                 'prada': 8
             }
-            brand_score = brand_scores.get(self.brand.lower() if self.brand else '', 5)
+            brand_score = brand_scores.get(item.brand.lower() if item.brand else '', 5)
             factors['brand_value'] = brand_score
             total_score += brand_score
             max_score += 10
@@ -140,25 +149,34 @@ class PortfolioItem(db.Model):
             # Calculate final rating (0-10 scale)
             final_rating = (total_score / max_score) * 10
             
-            self.fliplens_rating = round(final_rating, 1)
-            self.rating_factors = factors
-            
-            return self.fliplens_rating
+            return round(final_rating, 1), factors
             
         except Exception as e:
             logger.error(f"Failed to calculate FlipLens rating: {str(e)}")
-            self.fliplens_rating = 5.0  # Default rating
-            return self.fliplens_rating
+            return 5.0, None  # Default rating
     
-    def calculate_profit_loss(self):
-        """Calculate current profit or loss"""
-        if not self.current_market_price:
+    def calculate_fliplens_rating(self):
+        """Calculate FlipLens rating based on multiple factors"""
+        rating, factors = self._rating_for(self)
+        self.fliplens_rating = rating
+        if factors is not None:
+            self.rating_factors = factors
+        return rating
+    
+    @staticmethod
+    def _profit_loss_for(item):
+        """Calculate profit or loss for an item or a row with the same columns"""
+        if not item.current_market_price:
             return None
         
-        if self.status == 'sold' and self.sale_price:
-            return float(self.sale_price) - float(self.purchase_price)
+        if item.status == 'sold' and item.sale_price:
+            return float(item.sale_price) - float(item.purchase_price)
         else:
-            return float(self.current_market_price) - float(self.purchase_price)
+            return float(item.current_market_price) - float(item.purchase_price)
+    
+    def calculate_profit_loss(self):
+        """Calculate current profit or loss"""
+        return self._profit_loss_for(self)
     
     def get_profit_percentage(self):
         """Calculate profit percentage"""
@@ -188,43 +206,59 @@ class PortfolioItem(db.Model):
         self.sale_platform = platform
         self.sale_date = datetime.utcnow()
     
+    @classmethod
+    def current_value_expression(cls):
+        """SQL expression for an item's current value, for aggregating without loading rows"""
+        # Non-zero comparisons mirror the truthiness checks in calculate_profit_loss
+        # (NULL compares as unknown, so those rows fall through to the next branch)
+        return case(
+            (and_(cls.status == 'sold', cls.sale_price != 0), cls.sale_price),
+            (cls.current_market_price != 0, cls.current_market_price),
+            else_=cls.purchase_price
+        )
+    
     def to_dict(self):
         """Convert portfolio item to dictionary"""
-        profit_loss = self.calculate_profit_loss()
-        profit_percentage = self.get_profit_percentage()
+        return self.row_to_dict(self)
+    
+    @classmethod
+    def row_to_dict(cls, row):
+        """Convert a portfolio_items row (or item instance) to dictionary without ORM hydration"""
+        profit_loss = cls._profit_loss_for(row)
+        profit_percentage = (profit_loss / float(row.purchase_price)) * 100 if profit_loss is not None else None
         
         return {
-            'id': self.id,
-            'user_id': self.user_id,
-            'item_name': self.item_name,
-            'brand': self.brand,
-            'model': self.model,
-            'size': self.size,
-            'color': self.color,
-            'condition': self.condition,
-            'category': self.category,
-            'purchase_price': float(self.purchase_price) if self.purchase_price else None,
-            'purchase_date': self.purchase_date.isoformat() if self.purchase_date else None,
-            'purchase_platform': self.purchase_platform,
-            'purchase_location': self.purchase_location,
-            'current_market_price': float(self.current_market_price) if self.current_market_price else None,
-            'last_price_update': self.last_price_update.isoformat() if self.last_price_update else None,
-            'fliplens_rating': self.fliplens_rating,
-            'rating_factors': self.rating_factors,
-            'status': self.status,
-            'listing_price': float(self.listing_price) if self.listing_price else None,
-            'listing_platform': self.listing_platform,
-            'listing_date': self.listing_date.isoformat() if self.listing_date else None,
-            'sale_price': float(self.sale_price) if self.sale_price else None,
-            'sale_date': self.sale_date.isoformat() if self.sale_date else None,
-            'sale_platform': self.sale_platform,
+            'id': row.id,
+            'user_id': row.user_id,
+            'item_name': row.item_name,
+            'brand': row.brand,
+            'model': row.model,
+            'size': row.size,
+            'color': row.color,
+            'condition': row.condition,
+            'category': row.category,
+            'purchase_price': float(row.purchase_price) if row.purchase_price else None,
+            'purchase_date': row.purchase_date.isoformat() if row.purchase_date else None,
+            'purchase_platform': row.purchase_platform,
+            'purchase_location': row.purchase_location,
+            'current_market_price': float(row.current_market_price) if row.current_market_price else None,
+            'last_price_update': row.last_price_update.isoformat() if row.last_price_update else None,
+            'fliplens_rating': row.fliplens_rating,
+            'rating_factors': row.rating_factors,
+            'status': row.status,
+            'listing_price': float(row.listing_price) if row.listing_price else None,
+            'listing_platform': row.listing_platform,
+            'listing_date': row.listing_date.isoformat() if row.listing_date else None,
+            'sale_price': float(row.sale_price) if row.sale_price else None,
+            'sale_date': row.sale_date.isoformat() if row.sale_date else None,
+            'sale_platform': row.sale_platform,
             'profit_loss': profit_loss,
             'profit_percentage': profit_percentage,
-            'images': self.images,
-            'notes': self.notes,
-            'tags': self.tags.split(',') if self.tags else [],
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'images': row.images,
+            'notes': row.notes,
+            'tags': row.tags.split(',') if row.tags else [],
+            'created_at': row.created_at.isoformat() if row.created_at else None,
+            'updated_at': row.updated_at.isoformat() if row.updated_at else None,
         }
     
     @classmethod
@@ -235,7 +269,7 @@ class PortfolioItem(db.Model):
                 user_id=user_id,
                 item_name=item_data['item_name'],
                 purchase_price=item_data['purchase_price'],
-                purchase_date=datetime.fromisoformat(item_data['purchase_date'].replace('Z', '+00:00')),
+                purchase_date=ciso8601.parse_datetime(item_data['purchase_date']),
                 condition=item_data['condition'],
                 brand=item_data.get('brand'),
                 model=item_data.get('model'),
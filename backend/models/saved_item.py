@@ -3,13 +3,18 @@ SavedItem model for FlipLens application
 """
 
 from datetime import datetime
+from flask import current_app
 from flask_sqlalchemy import SQLAlchemy
 import logging
 
 from .database import db
+from utils.cache import cache
 
 logger = logging.getLogger(__name__)
 
+# Serialized saved items are keyed by updated_at, so an edit naturally misses the old entry
+SAVED_ITEM_JSON_CACHE_TTL = 3600
+
 class SavedItem(db.Model):
     """Model for items saved by users"""
     
@@ -58,6 +63,7 @@ class SavedItem(db.Model):
     # Unique constraint to prevent duplicate saves
     __table_args__ = (
         db.UniqueConstraint('user_id', 'ebay_item_id', name='unique_user_item'),
+        db.Index('ix_saved_user_created', user_id, created_at.desc()),
     )
     
     def __init__(self, user_id, ebay_item_id, title, price, currency='USD', **kwargs):
@@ -132,11 +138,16 @@ class SavedItem(db.Model):
                 tags_list.remove(tag)
                 self.tags = ','.join(tags_list) if tags_list else None
     
+    @staticmethod
+    def _split_tags(tags):
+        """Split a comma-separated tags string into a list"""
+        if not tags:
+            return []
+        return [t.strip() for t in tags.split(',') if t.strip()]
+    
     def get_tags_list(self):
         """Get tags as a list"""
-        if not self.tags:
-            return []
-        return [t.strip() for t in self.tags.split(',') if t.strip()]
+        return self._split_tags(self.tags)
     
     def mark_purchased(self, purchase_price, purchase_date=None):
         """Mark item as purchased"""
@@ -152,42 +163,66 @@ class SavedItem(db.Model):
         self.sale_date = sale_date or datetime.utcnow()
         self.updated_at = datetime.utcnow()
     
+    @staticmethod
+    def _actual_profit_for(item):
+        """Calculate actual profit for an item or a row with the same columns"""
+        if item.status == 'sold' and item.purchase_price and item.sale_price:
+            return float(item.sale_price) - float(item.purchase_price)
+        return None
+    
     def calculate_actual_profit(self):
         """Calculate actual profit if item was purchased and sold"""
-        if self.status == 'sold' and self.purchase_price and self.sale_price:
-            return float(self.sale_price) - float(self.purchase_price)
-        return None
+        return self._actual_profit_for(self)
     
     def to_dict(self):
         """Convert saved item to dictionary"""
+        return self.row_to_dict(self)
+    
+    @classmethod
+    def row_to_dict(cls, row):
+        """Convert a saved_items row (or item instance) to dictionary without ORM hydration"""
         return {
-            'id': self.id,
-            'user_id': self.user_id,
-            'ebay_item_id': self.ebay_item_id,
-            'title': self.title,
-            'price': float(self.price) if self.price else None,
-            'currency': self.currency,
-            'image_url': self.image_url,
-            'item_url': self.item_url,
-            'condition': self.condition,
-            'location': self.location,
-            'shipping_cost': float(self.shipping_cost) if self.shipping_cost else None,
-            'estimated_profit': float(self.estimated_profit) if self.estimated_profit else None,
-            'confidence_score': self.confidence_score,
-            'market_data': self.market_data,
-            'notes': self.notes,
-            'tags': self.get_tags_list(),
-            'is_favorite': self.is_favorite,
-            'status': self.status,
-            'purchase_price': float(self.purchase_price) if self.purchase_price else None,
-            'purchase_date': self.purchase_date.isoformat() if self.purchase_date else None,
-            'sale_price': float(self.sale_price) if self.sale_price else None,
-            'sale_date': self.sale_date.isoformat() if self.sale_date else None,
-            'actual_profit': self.calculate_actual_profit(),
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'id': row.id,
+            'user_id': row.user_id,
+            'ebay_item_id': row.ebay_item_id,
+            'title': row.title,
+            'price': float(row.price) if row.price else None,
+            'currency': row.currency,
+            'image_url': row.image_url,
+            'item_url': row.item_url,
+            'condition': row.condition,
+            'location': row.location,
+            'shipping_cost': float(row.shipping_cost) if row.shipping_cost else None,
+            'estimated_profit': float(row.estimated_profit) if row.estimated_profit else None,
+            'confidence_score': row.confidence_score,
+            'market_data': row.market_data,
+            'notes': row.notes,
+            'tags': cls._split_tags(row.tags),
+            'is_favorite': row.is_favorite,
+            'status': row.status,
+            'purchase_price': float(row.purchase_price) if row.purchase_price else None,
+            'purchase_date': row.purchase_date.isoformat() if row.purchase_date else None,
+            'sale_price': float(row.sale_price) if row.sale_price else None,
+            'sale_date': row.sale_date.isoformat() if row.sale_date else None,
+            'actual_profit': cls._actual_profit_for(row),
+            'created_at': row.created_at.isoformat() if row.created_at else None,
+            'updated_at': row.updated_at.isoformat() if row.updated_at else None,
         }
     
+    def to_json_bytes(self):
+        """Return to_dict() serialized as JSON bytes, cached until the item is next updated"""
+        return self.row_to_json_bytes(self)
+    
+    @classmethod
+    def row_to_json_bytes(cls, row):
+        """Return row_to_dict() serialized as JSON bytes, cached until the row is next updated"""
+        version = row.updated_at.isoformat() if row.updated_at else ''
+        return cache.get_or_set(
+            f'saved_item_json:{row.id}:{version}',
+            SAVED_ITEM_JSON_CACHE_TTL,
+            lambda: current_app.json.dumps_bytes(cls.row_to_dict(row))
+        )
+    
     @classmethod
     def create_saved_item(cls, user_id, item_data):
         """Create a new saved item with validation"""
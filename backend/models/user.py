@@ -3,17 +3,25 @@ User model for FlipLens application
 """
 
 from datetime import datetime, timedelta
+from functools import lru_cache
 from flask_sqlalchemy import SQLAlchemy
-from werkzeug.security import generate_password_hash, check_password_hash
 import jwt
 from flask import current_app
 import secrets
 import logging
+import time
 
 from .database import db
+from utils.passwords import hash_password, verify_password, needs_rehash
 
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=10_000)
+def _decode_jwt_claims(token, secret_key):
+    """Verify JWT signature once and cache its claims (invalid tokens raise and are not cached)"""
+    payload = jwt.decode(token, secret_key, algorithms=['HS256'])
+    return payload.get('user_id'), payload.get('exp')
+
 class User(db.Model):
     """User model with authentication and profile management"""
     
@@ -46,6 +54,7 @@ class User(db.Model):
     # Relationships
     saved_items = db.relationship('SavedItem', backref='user', lazy='dynamic', cascade='all, delete-orphan')
     search_history = db.relationship('SearchHistory', backref='user', lazy='dynamic', cascade='all, delete-orphan')
+    settings = db.relationship('UserSettings', uselist=False, back_populates='user', cascade='all, delete-orphan')
     
     def __init__(self, email, username, password, first_name=None, last_name=None):
         self.email = email.lower().strip()
@@ -60,11 +69,17 @@ class User(db.Model):
     
     def set_password(self, password):
         """Set password hash"""
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = hash_password(password)
     
     def check_password(self, password):
         """Check password against hash"""
-        return check_password_hash(self.password_hash, password)
+        if not verify_password(self.password_hash, password):
+            return False
+
+        # Transparently upgrade legacy pbkdf2 hashes; persisted with the caller's next commit
+        if needs_rehash(self.password_hash):
+            self.password_hash = hash_password(password)
+        return True
     
     def generate_verification_token(self):
         """Generate email verification token"""
@@ -109,20 +124,19 @@ class User(db.Model):
             return None
     
     @staticmethod
-    def verify_jwt_token(token):
-        """Verify JWT token and return user"""
+    def verify_jwt_token(token, load_options=()):
+        """Verify JWT token and return user, loaded with any extra loader options (e.g. joinedload)"""
         try:
-            payload = jwt.decode(
-                token,
-                current_app.config['SECRET_KEY'],
-                algorithms=['HS256']
-            )
+            user_id, exp = _decode_jwt_claims(token, current_app.config['SECRET_KEY'])
+            
+            # Cached claims outlive the token, so re-check expiry on every hit
+            if exp is not None and exp < time.time():
+                raise jwt.ExpiredSignatureError("Signature has expired")
             
-            user_id = payload.get('user_id')
             if not user_id:
                 return None
             
-            user = User.query.get(user_id)
+            user = db.session.get(User, user_id, options=load_options)
             if not user or not user.is_active:
                 return None
             
@@ -3,13 +3,19 @@ User Settings model for FlipLens application
 """
 
 from datetime import datetime
+from flask import current_app
 from flask_sqlalchemy import SQLAlchemy
 import logging
+import orjson
 
 from .database import db
+from utils.cache import cache
 
 logger = logging.getLogger(__name__)
 
+# Serialized settings are keyed by updated_at, so every update/reset naturally misses the old entry
+USER_SETTINGS_JSON_CACHE_TTL = 3600
+
 class UserSettings(db.Model):
     """Model for user application settings"""
     
@@ -60,7 +66,7 @@ class UserSettings(db.Model):
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     
     # Relationship
-    user = db.relationship('User', backref=db.backref('settings', uselist=False))
+    user = db.relationship('User', back_populates='settings')
     
     def __init__(self, user_id, **kwargs):
         self.user_id = user_id
@@ -124,6 +130,15 @@ class UserSettings(db.Model):
             'updated_at': self.updated_at.isoformat() if self.updated_at else None,
         }
     
+    def to_json_fragment(self):
+        """Return to_dict() as a pre-encoded orjson Fragment, cached until the settings are next updated"""
+        version = self.updated_at.isoformat() if self.updated_at else ''
+        return cache.get_or_set(
+            f'user_settings_json:{self.id}:{version}',
+            USER_SETTINGS_JSON_CACHE_TTL,
+            lambda: orjson.Fragment(current_app.json.dumps_bytes(self.to_dict()))
+        )
+    
     def update_settings(self, settings_data):
         """Update user settings"""
         try:
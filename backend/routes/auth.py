@@ -132,7 +132,7 @@ def register():
                     "code": "TOKEN_GENERATION_FAILED"
                 }), 500
             
-            logger.info(f"User registered successfully: {user.username} ({user.email})")
+            logger.info("User registered successfully: %s (%s)", user.username, user.email)
             
             return jsonify({
                 "message": "User registered successfully",
@@ -150,7 +150,7 @@ def register():
             }), 409
         
     except Exception as e:
-        logger.error(f"Registration error: {str(e)}", exc_info=True)
+        logger.error("Registration error: %s", e, exc_info=True)
         return jsonify({
             "error": "Internal Server Error",
             "message": "Registration failed due to server error",
@@ -224,7 +224,7 @@ def login():
         # Update last login
         user.update_last_login()
         
-        logger.info(f"User logged in successfully: {user.username}")
+        logger.info("User logged in successfully: %s", user.username)
         
         return jsonify({
             "message": "Login successful",
@@ -234,7 +234,7 @@ def login():
         }), 200
         
     except Exception as e:
-        logger.error(f"Login error: {str(e)}", exc_info=True)
+        logger.error("Login error: %s", e, exc_info=True)
         return jsonify({
             "error": "Internal Server Error",
             "message": "Login failed due to server error",
@@ -248,9 +248,10 @@ def get_current_user():
     """Get current user information"""
     try:
         # Get token from Authorization header
-        auth_header = request.headers.get('Authorization')
+        auth_header = request.headers.get('Authorization') or ''
+        token = auth_header[7:].strip() if auth_header.startswith('Bearer ') else ''
         
-        if not auth_header or not auth_header.startswith('Bearer '):
+        if not token:
             return jsonify({
                 "error": "Missing Token",
                 "message": "Authorization token is required",
@@ -258,8 +259,6 @@ def get_current_user():
                 "code": "MISSING_TOKEN"
             }), 401
         
-        token = auth_header.split(' ')[1]
-        
         # Verify token and get user
         user = User.verify_jwt_token(token)
         
@@ -277,7 +276,7 @@ def get_current_user():
         }), 200
         
     except Exception as e:
-        logger.error(f"Get current user error: {str(e)}", exc_info=True)
+        logger.error("Get current user error: %s", e, exc_info=True)
         return jsonify({
             "error": "Internal Server Error",
             "message": "Failed to get user information",
@@ -295,11 +294,11 @@ def logout():
         
         auth_header = request.headers.get('Authorization')
         if auth_header and auth_header.startswith('Bearer '):
-            token = auth_header.split(' ')[1]
-            user = User.verify_jwt_token(token)
+            token = auth_header[7:].strip()
+            user = User.verify_jwt_token(token) if token else None
             
             if user:
-                logger.info(f"User logged out: {user.username}")
+                logger.info("User logged out: %s", user.username)
         
         return jsonify({
             "message": "Logout successful",
@@ -307,7 +306,7 @@ def logout():
         }), 200
         
     except Exception as e:
-        logger.error(f"Logout error: {str(e)}", exc_info=True)
+        logger.error("Logout error: %s", e, exc_info=True)
         return jsonify({
             "error": "Internal Server Error",
             "message": "Logout failed due to server error",
@@ -8,11 +8,40 @@ from utils.rate_limiter import rate_limit
 from utils.auth_middleware import auth_optional, get_current_user
 from models.market_trend import MarketTrend
 from models.database import db
+from cachetools import TTLCache
 import logging
+import threading
 from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
 
+# Trend data is recorded at most daily, so reads can be served from a short-lived cache
+TREND_CACHE_TTL = 300
+TREND_CACHE_CONTROL = f'public, max-age={TREND_CACHE_TTL}'
+# Mock data served because the query failed must not be reused by the cache or clients
+FALLBACK_CACHE_CONTROL = 'no-store'
+_trend_cache = TTLCache(maxsize=10_000, ttl=TREND_CACHE_TTL)
+_trend_cache_lock = threading.Lock()
+
+# Static lookup tables shared by every request
+SUPPORTED_PLATFORMS = (
+    {"id": "ebay", "name": "eBay", "active": True},
+    {"id": "poshmark", "name": "Poshmark", "active": True},
+    {"id": "mercari", "name": "Mercari", "active": True},
+    {"id": "depop", "name": "Depop", "active": False},
+    {"id": "vinted", "name": "Vinted", "active": False},
+    {"id": "facebook", "name": "Facebook Marketplace", "active": False},
+)
+
+SUPPORTED_CONDITIONS = (
+    {"id": "new", "name": "New", "description": "Brand new with tags"},
+    {"id": "excellent", "name": "Excellent", "description": "Like new, no visible wear"},
+    {"id": "very_good", "name": "Very Good", "description": "Minor signs of wear"},
+    {"id": "good", "name": "Good", "description": "Some signs of wear"},
+    {"id": "fair", "name": "Fair", "description": "Noticeable wear"},
+    {"id": "poor", "name": "Poor", "description": "Significant wear"},
+)
+
 @api_bp.route('/market-trends/<item_identifier>', methods=['GET'])
 @rate_limit('/api/market-trends')
 @auth_optional
@@ -22,41 +51,13 @@ def get_market_trends(item_identifier):
         # Get query parameters
         platform = request.args.get('platform')
         condition = request.args.get('condition')
-        days_back = request.args.get('days_back', 30, type=int)
-        
-        # Validate days_back
-        if days_back < 1 or days_back > 365:
-            return jsonify({
-                "error": "Invalid Time Range",
-                "message": "days_back must be between 1 and 365",
-                "status": "error",
-                "code": "INVALID_TIME_RANGE"
-            }), 400
-        
-        logger.info(f"Getting market trends for {item_identifier} (platform: {platform}, condition: {condition}, days: {days_back})")
-        
-        # Get price trends
-        trends = MarketTrend.get_price_trends(
-            item_identifier=item_identifier,
-            platform=platform,
-            condition=condition,
-            days_back=days_back
-        )
+        days_back = _parse_days_back()
         
-        # Get market summary
-        summary = MarketTrend.get_market_summary(
-            item_identifier=item_identifier,
-            platform=platform,
-            condition=condition,
-            days_back=days_back
-        )
+        logger.info("Getting market trends for %s (platform: %s, condition: %s, days: %s)", item_identifier, platform, condition, days_back)
         
-        # If no real data, generate mock data for demonstration
-        if not trends:
-            trends = _generate_mock_trend_data(item_identifier, platform, condition, days_back)
-            summary = _calculate_mock_summary(trends)
+        trends, summary, cache_control = _get_trends_and_summary(item_identifier, platform, condition, days_back)
         
-        return jsonify({
+        response = jsonify({
             "item_identifier": item_identifier,
             "platform": platform,
             "condition": condition,
@@ -64,10 +65,12 @@ def get_market_trends(item_identifier):
             "trends": trends,
             "summary": summary,
             "status": "success"
-        }), 200
+        })
+        response.headers['Cache-Control'] = cache_control
+        return response, 200
         
     except Exception as e:
-        logger.error(f"Error getting market trends: {str(e)}", exc_info=True)
+        logger.error("Error getting market trends: %s", e, exc_info=True)
         return jsonify({
             "error": "Internal Server Error",
             "message": "Failed to retrieve market trends",
@@ -84,31 +87,22 @@ def get_market_summary(item_identifier):
         # Get query parameters
         platform = request.args.get('platform')
         condition = request.args.get('condition')
-        days_back = request.args.get('days_back', 30, type=int)
-        
-        logger.info(f"Getting market summary for {item_identifier}")
+        days_back = _parse_days_back()
         
-        # Get market summary
-        summary = MarketTrend.get_market_summary(
-            item_identifier=item_identifier,
-            platform=platform,
-            condition=condition,
-            days_back=days_back
-        )
+        logger.info("Getting market summary for %s", item_identifier)
         
-        # If no real data, generate mock summary
-        if not summary:
-            mock_trends = _generate_mock_trend_data(item_identifier, platform, condition, days_back)
-            summary = _calculate_mock_summary(mock_trends)
+        _, summary, cache_control = _get_trends_and_summary(item_identifier, platform, condition, days_back)
         
-        return jsonify({
+        response = jsonify({
             "item_identifier": item_identifier,
             "summary": summary,
             "status": "success"
-        }), 200
+        })
+        response.headers['Cache-Control'] = cache_control
+        return response, 200
         
     except Exception as e:
-        logger.error(f"Error getting market summary: {str(e)}", exc_info=True)
+        logger.error("Error getting market summary: %s", e, exc_info=True)
         return jsonify({
             "error": "Internal Server Error",
             "message": "Failed to retrieve market summary",
@@ -120,57 +114,56 @@ def get_market_summary(item_identifier):
 @rate_limit('/api/market-trends')
 def get_supported_platforms():
     """Get list of supported platforms"""
-    try:
-        platforms = [
-            {"id": "ebay", "name": "eBay", "active": True},
-            {"id": "poshmark", "name": "Poshmark", "active": True},
-            {"id": "mercari", "name": "Mercari", "active": True},
-            {"id": "depop", "name": "Depop", "active": False},
-            {"id": "vinted", "name": "Vinted", "active": False},
-            {"id": "facebook", "name": "Facebook Marketplace", "active": False},
-        ]
-        
-        return jsonify({
-            "platforms": platforms,
-            "status": "success"
-        }), 200
-        
-    except Exception as e:
-        logger.error(f"Error getting platforms: {str(e)}", exc_info=True)
-        return jsonify({
-            "error": "Internal Server Error",
-            "message": "Failed to retrieve platforms",
-            "status": "error",
-            "code": "INTERNAL_SERVER_ERROR"
-        }), 500
+    return jsonify({
+        "platforms": SUPPORTED_PLATFORMS,
+        "status": "success"
+    }), 200
 
 @api_bp.route('/market-trends/conditions', methods=['GET'])
 @rate_limit('/api/market-trends')
 def get_supported_conditions():
     """Get list of supported item conditions"""
-    try:
-        conditions = [
-            {"id": "new", "name": "New", "description": "Brand new with tags"},
-            {"id": "excellent", "name": "Excellent", "description": "Like new, no visible wear"},
-            {"id": "very_good", "name": "Very Good", "description": "Minor signs of wear"},
-            {"id": "good", "name": "Good", "description": "Some signs of wear"},
-            {"id": "fair", "name": "Fair", "description": "Noticeable wear"},
-            {"id": "poor", "name": "Poor", "description": "Significant wear"},
-        ]
-        
-        return jsonify({
-            "conditions": conditions,
-            "status": "success"
-        }), 200
-        
-    except Exception as e:
-        logger.error(f"Error getting conditions: {str(e)}", exc_info=True)
-        return jsonify({
-            "error": "Internal Server Error",
-            "message": "Failed to retrieve conditions",
-            "status": "error",
-            "code": "INTERNAL_SERVER_ERROR"
-        }), 500
+    return jsonify({
+        "conditions": SUPPORTED_CONDITIONS,
+        "status": "success"
+    }), 200
+
+def _get_trends_and_summary(item_identifier, platform, condition, days_back):
+    """Get price trends, summary and the Cache-Control header to send them with
+
+    Query results (including an empty result) are cached for TREND_CACHE_TTL seconds; the
+    fallback served when the query fails is not cached.
+    """
+    key = (item_identifier, platform, condition, days_back)
+    with _trend_cache_lock:
+        cached = _trend_cache.get(key)
+    if cached is not None:
+        return (*cached, TREND_CACHE_CONTROL)
+    
+    trends, summary = MarketTrend.get_trends_and_summary(
+        item_identifier=item_identifier,
+        platform=platform,
+        condition=condition,
+        days_back=days_back
+    )
+    query_failed = trends is None
+    
+    # If no real data, generate mock data for demonstration
+    if not trends:
+        trends = _generate_mock_trend_data(item_identifier, platform, condition, days_back)
+        summary = _calculate_mock_summary(trends)
+    
+    if query_failed:
+        return trends, summary, FALLBACK_CACHE_CONTROL
+    
+    with _trend_cache_lock:
+        _trend_cache[key] = (trends, summary)
+    
+    return trends, summary, TREND_CACHE_CONTROL
+
+def _parse_days_back():
+    """Read days_back from the query string, clamped to 1-365 (defaults to 30)"""
+    return max(1, min(365, request.args.get('days_back', 30, type=int)))
 
 def _generate_mock_trend_data(item_identifier, platform, condition, days_back):
     """Generate mock trend data for demonstration"""
@@ -179,9 +172,10 @@ def _generate_mock_trend_data(item_identifier, platform, condition, days_back):
     
     trends = []
     base_price = 50 + (hash(item_identifier) % 200)  # Base price between 50-250
+    now = datetime.utcnow()
     
     for i in range(min(days_back, 30)):  # Generate up to 30 data points
-        date = datetime.utcnow() - timedelta(days=days_back - i)
+        timestamp = (now - timedelta(days=days_back - i)).isoformat()
         
         # Add some realistic price variation
         variation = random.uniform(-0.2, 0.2)  # ±20% variation
@@ -201,8 +195,8 @@ def _generate_mock_trend_data(item_identifier, platform, condition, days_back):
             'listing_count': random.randint(5, 50),
             'sold_count': random.randint(1, 10),
             'confidence_score': random.uniform(0.7, 0.95),
-            'recorded_at': date.isoformat(),
-            'created_at': date.isoformat(),
+            'recorded_at': timestamp,
+            'created_at': timestamp,
         })
     
     return trends
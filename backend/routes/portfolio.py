@@ -2,15 +2,21 @@
 Portfolio routes for FlipLens application
 """
 
-from flask import jsonify, request, g
+from flask import jsonify, request, g, current_app
 from . import api_bp
 from utils.rate_limiter import rate_limit
 from utils.auth_middleware import auth_required, get_current_user
-from utils.validation import validate_json_input
+from utils.validation import validate_json_input, validate_pagination_params
+from utils.pagination import encode_cursor, decode_cursor
+from utils.cache import cache
 from models.portfolio_item import PortfolioItem
 from models.database import db
+from sqlalchemy import func, select, tuple_, update
 import logging
+import math
+import ciso8601
 from datetime import datetime
+from types import SimpleNamespace
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +41,26 @@ PORTFOLIO_ITEM_SCHEMA = {
     }
 }
 
+# Portfolio summaries are cached per user and invalidated on every write
+PORTFOLIO_SUMMARY_CACHE_TTL = 300
+
+# Columns the portfolio listing may be sorted by; anything else falls back to created_at
+PORTFOLIO_SORT_COLUMNS = {
+    'created_at': PortfolioItem.created_at,
+    'purchase_date': PortfolioItem.purchase_date,
+    'purchase_price': PortfolioItem.purchase_price,
+    'current_market_price': PortfolioItem.current_market_price,
+    'fliplens_rating': PortfolioItem.fliplens_rating,
+    'item_name': PortfolioItem.item_name,
+}
+
+# Fields a client may change through PUT /portfolio/<id>
+UPDATABLE_PORTFOLIO_FIELDS = frozenset({
+    'item_name', 'brand', 'model', 'size', 'color', 'condition', 'category',
+    'purchase_price', 'purchase_date', 'purchase_platform', 'purchase_location',
+    'current_market_price', 'listing_price', 'listing_platform', 'notes', 'tags'
+})
+
 @api_bp.route('/portfolio', methods=['GET'])
 @rate_limit('/api/portfolio')
 @auth_required
@@ -51,83 +77,94 @@ def get_portfolio():
             }), 401
         
         # Get query parameters
-        page = request.args.get('page', 1, type=int)
-        per_page = min(request.args.get('per_page', 20, type=int), 100)
-        status = request.args.get('status')  # owned, listed, sold
-        sort_by = request.args.get('sort_by', 'created_at')
-        sort_order = request.args.get('sort_order', 'desc')
+        args = request.args
+        page, per_page = validate_pagination_params(args.get('page'), args.get('per_page'))
+        status = args.get('status')  # owned, listed, sold
+        sort_by = args.get('sort_by', 'created_at')
+        sort_desc = args.get('sort_order', 'desc').lower() == 'desc'
+        cursor = args.get('cursor')
         
         logger.info(f"Getting portfolio for user {user.id} (page: {page}, per_page: {per_page})")
         
-        # Build query
-        query = PortfolioItem.query.filter_by(user_id=user.id)
+        # Build filters
+        filters = [PortfolioItem.user_id == user.id]
         
         # Apply status filter
         if status:
-            query = query.filter(PortfolioItem.status == status)
-        
-        # Apply sorting
-        sort_column = getattr(PortfolioItem, sort_by, PortfolioItem.created_at)
-        if sort_order.lower() == 'desc':
-            query = query.order_by(sort_column.desc())
+            filters.append(PortfolioItem.status == status)
+        
+        # Select plain rows for the listing instead of hydrating ORM instances
+        stmt = select(PortfolioItem.__table__).where(*filters)
+        
+        if cursor:
+            # Keyset pagination always walks the default newest-first order
+            try:
+                cursor_created_at, cursor_id = decode_cursor(cursor)
+            except ValueError:
+                return jsonify({
+                    "error": "Invalid Cursor",
+                    "message": "Pagination cursor is invalid",
+                    "status": "error",
+                    "code": "INVALID_CURSOR"
+                }), 400
+            
+            rows = db.session.execute(
+                stmt.where(
+                    tuple_(PortfolioItem.created_at, PortfolioItem.id) < (cursor_created_at, cursor_id)
+                ).order_by(
+                    PortfolioItem.created_at.desc(), PortfolioItem.id.desc()
+                ).limit(per_page + 1)
+            ).all()
+            
+            page_rows = rows[:per_page]
+            has_next = len(rows) > per_page
+            pagination_data = {
+                "per_page": per_page,
+                "has_next": has_next,
+                "next_cursor": encode_cursor(page_rows[-1].created_at, page_rows[-1].id) if has_next else None
+            }
         else:
-            query = query.order_by(sort_column.asc())
-        
-        # Paginate
-        pagination = query.paginate(
-            page=page,
-            per_page=per_page,
-            error_out=False
-        )
-        
-        items = [item.to_dict() for item in pagination.items]
-        
-        # Calculate portfolio summary
-        total_items = PortfolioItem.query.filter_by(user_id=user.id).count()
-        owned_items = PortfolioItem.query.filter_by(user_id=user.id, status='owned').count()
-        listed_items = PortfolioItem.query.filter_by(user_id=user.id, status='listed').count()
-        sold_items = PortfolioItem.query.filter_by(user_id=user.id, status='sold').count()
-        
-        # Calculate total investment and current value
-        all_items = PortfolioItem.query.filter_by(user_id=user.id).all()
-        total_investment = sum(float(item.purchase_price) for item in all_items)
-        current_value = 0
-        total_profit_loss = 0
-        
-        for item in all_items:
-            if item.status == 'sold' and item.sale_price:
-                current_value += float(item.sale_price)
-                total_profit_loss += float(item.sale_price) - float(item.purchase_price)
-            elif item.current_market_price:
-                current_value += float(item.current_market_price)
-                total_profit_loss += float(item.current_market_price) - float(item.purchase_price)
+            # Apply sorting
+            sort_column = PORTFOLIO_SORT_COLUMNS.get(sort_by, PortfolioItem.created_at)
+            is_default_order = sort_column is PortfolioItem.created_at and sort_desc
+            if is_default_order:
+                stmt = stmt.order_by(PortfolioItem.created_at.desc(), PortfolioItem.id.desc())
+            elif sort_desc:
+                stmt = stmt.order_by(sort_column.desc())
             else:
-                current_value += float(item.purchase_price)  # Use purchase price as fallback
-        
-        portfolio_summary = {
-            'total_items': total_items,
-            'owned_items': owned_items,
-            'listed_items': listed_items,
-            'sold_items': sold_items,
-            'total_investment': round(total_investment, 2),
-            'current_value': round(current_value, 2),
-            'total_profit_loss': round(total_profit_loss, 2),
-            'profit_percentage': round((total_profit_loss / total_investment * 100), 2) if total_investment > 0 else 0
-        }
+                stmt = stmt.order_by(sort_column.asc())
+            
+            # Paginate
+            total = db.session.scalar(select(func.count()).select_from(PortfolioItem).where(*filters))
+            page_rows = db.session.execute(stmt.limit(per_page).offset((page - 1) * per_page)).all()
+            
+            pages = math.ceil(total / per_page)
+            has_next = page < pages
+            pagination_data = {
+                "page": page,
+                "per_page": per_page,
+                "total": total,
+                "pages": pages,
+                "has_next": has_next,
+                "has_prev": page > 1,
+                # Lets clients switch to cursor pagination for the following pages
+                "next_cursor": encode_cursor(page_rows[-1].created_at, page_rows[-1].id)
+                               if is_default_order and has_next and page_rows else None
+            }
+        
+        # Portfolio summary only changes on writes, which invalidate this key
+        portfolio_summary = cache.get_or_set(
+            portfolio_summary_cache_key(user.id),
+            PORTFOLIO_SUMMARY_CACHE_TTL,
+            lambda: _calculate_portfolio_summary(user.id)
+        )
         
-        return jsonify({
-            "items": items,
-            "pagination": {
-                "page": pagination.page,
-                "per_page": pagination.per_page,
-                "total": pagination.total,
-                "pages": pagination.pages,
-                "has_next": pagination.has_next,
-                "has_prev": pagination.has_prev
-            },
+        # Stream items one at a time instead of building the full list and body in memory
+        return current_app.json.stream_response({
+            "pagination": pagination_data,
             "summary": portfolio_summary,
             "status": "success"
-        }), 200
+        }, "items", page_rows, PortfolioItem.row_to_dict), 200
         
     except Exception as e:
         logger.error(f"Error getting portfolio: {str(e)}", exc_info=True)
@@ -167,6 +204,7 @@ def add_portfolio_item():
         
         # Create portfolio item
         portfolio_item = PortfolioItem.create_portfolio_item(user.id, data)
+        cache.delete(portfolio_summary_cache_key(user.id))
         
         return jsonify({
             "item": portfolio_item.to_dict(),
@@ -238,17 +276,6 @@ def update_portfolio_item(item_id):
                 "code": "AUTH_REQUIRED"
             }), 401
         
-        # Get portfolio item
-        item = PortfolioItem.query.filter_by(id=item_id, user_id=user.id).first()
-        
-        if not item:
-            return jsonify({
-                "error": "Item Not Found",
-                "message": "Portfolio item not found",
-                "status": "error",
-                "code": "ITEM_NOT_FOUND"
-            }), 404
-        
         data = request.get_json()
         if not data:
             return jsonify({
@@ -260,38 +287,67 @@ def update_portfolio_item(item_id):
         
         logger.info(f"Updating portfolio item {item_id} for user {user.id}")
         
-        # Update fields
-        updatable_fields = [
-            'item_name', 'brand', 'model', 'size', 'color', 'condition', 'category',
-            'purchase_price', 'purchase_date', 'purchase_platform', 'purchase_location',
-            'current_market_price', 'listing_price', 'listing_platform', 'notes', 'tags'
-        ]
-        
-        for field in updatable_fields:
-            if field in data:
-                if field == 'purchase_date' and data[field]:
-                    setattr(item, field, datetime.fromisoformat(data[field].replace('Z', '+00:00')))
-                else:
-                    setattr(item, field, data[field])
+        # Collect every column change, then apply them in a single UPDATE
+        now = datetime.utcnow()
+        values = {field: data[field] for field in UPDATABLE_PORTFOLIO_FIELDS & data.keys()}
+        if values.get('purchase_date'):
+            values['purchase_date'] = ciso8601.parse_datetime(values['purchase_date'])
         
         # Update market price if provided
         if 'current_market_price' in data:
-            item.update_market_price(data['current_market_price'])
+            values['last_price_update'] = now
         
-        # Handle status changes
+        # Handle status changes (same fields as mark_as_listed / mark_as_sold)
         if 'status' in data:
             if data['status'] == 'listed' and 'listing_price' in data:
-                item.mark_as_listed(data['listing_price'], data.get('listing_platform'))
+                values.update(status='listed', listing_price=data['listing_price'],
+                              listing_platform=data.get('listing_platform'), listing_date=now)
             elif data['status'] == 'sold' and 'sale_price' in data:
-                item.mark_as_sold(data['sale_price'], data.get('sale_platform'))
+                values.update(status='sold', sale_price=data['sale_price'],
+                              sale_platform=data.get('sale_platform'), sale_date=now)
             else:
-                item.status = data['status']
+                values['status'] = data['status']
+        
+        values['updated_at'] = now
+        
+        item_filter = (PortfolioItem.id == item_id, PortfolioItem.user_id == user.id)
+        
+        # The rating depends on the merged row: read its stored inputs and overlay the new values,
+        # so the rating is written by the same UPDATE
+        if 'current_market_price' in data:
+            stored = db.session.execute(
+                select(PortfolioItem.purchase_price, PortfolioItem.condition, PortfolioItem.brand).where(*item_filter)
+            ).first()
+            # A missing item matches no row in the UPDATE below and gets the 404 there
+            if stored is not None:
+                rating, factors = PortfolioItem._rating_for(SimpleNamespace(**{**stored._asdict(), **values}))
+                values['fliplens_rating'] = rating
+                if factors is not None:
+                    values['rating_factors'] = factors
+        
+        columns = PortfolioItem.__table__.c
+        stmt = update(PortfolioItem).where(*item_filter).values(**values)
+        if db.engine.dialect.update_returning:
+            row = db.session.execute(stmt.returning(*columns)).first()
+        else:
+            # SQLite before 3.35 has no UPDATE ... RETURNING; read the row back instead
+            updated = db.session.execute(stmt).rowcount
+            row = db.session.execute(select(*columns).where(*item_filter)).first() if updated else None
+        
+        if row is None:
+            db.session.rollback()
+            return jsonify({
+                "error": "Item Not Found",
+                "message": "Portfolio item not found",
+                "status": "error",
+                "code": "ITEM_NOT_FOUND"
+            }), 404
         
-        item.updated_at = datetime.utcnow()
         db.session.commit()
+        cache.delete(portfolio_summary_cache_key(user.id))
         
         return jsonify({
-            "item": item.to_dict(),
+            "item": PortfolioItem.row_to_dict(row),
             "message": "Portfolio item updated successfully",
             "status": "success"
         }), 200
@@ -336,6 +392,7 @@ def delete_portfolio_item(item_id):
         
         db.session.delete(item)
         db.session.commit()
+        cache.delete(portfolio_summary_cache_key(user.id))
         
         return jsonify({
             "message": "Portfolio item deleted successfully",
@@ -351,3 +408,39 @@ def delete_portfolio_item(item_id):
             "status": "error",
             "code": "INTERNAL_SERVER_ERROR"
         }), 500
+
+def portfolio_summary_cache_key(user_id):
+    """Cache key for a user's portfolio summary"""
+    return f'pf_sum:{user_id}'
+
+def _calculate_portfolio_summary(user_id):
+    """Calculate portfolio totals for a user"""
+    # Single aggregate query per status
+    status_totals = db.session.query(
+        PortfolioItem.status,
+        func.count(PortfolioItem.id),
+        func.sum(PortfolioItem.purchase_price),
+        func.sum(PortfolioItem.current_value_expression())
+    ).filter(PortfolioItem.user_id == user_id).group_by(PortfolioItem.status).all()
+    
+    status_counts = {}
+    total_investment = 0
+    current_value = 0
+    
+    for item_status, count, investment, value in status_totals:
+        status_counts[item_status] = count
+        total_investment += float(investment or 0)
+        current_value += float(value or 0)
+    
+    total_profit_loss = current_value - total_investment
+    
+    return {
+        'total_items': sum(status_counts.values()),
+        'owned_items': status_counts.get('owned', 0),
+        'listed_items': status_counts.get('listed', 0),
+        'sold_items': status_counts.get('sold', 0),
+        'total_investment': round(total_investment, 2),
+        'current_value': round(current_value, 2),
+        'total_profit_loss': round(total_profit_loss, 2),
+        'profit_percentage': round((total_profit_loss / total_investment * 100), 2) if total_investment > 0 else 0
+    }
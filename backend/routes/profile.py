@@ -10,11 +10,16 @@ from utils.validation import validate_json_input
 from models.user import User
 from models.user_settings import UserSettings
 from models.database import db
+from sqlalchemy import select, exists, false, func
+from sqlalchemy.orm import joinedload
 import logging
-from werkzeug.security import check_password_hash, generate_password_hash
+import hmac
 
 logger = logging.getLogger(__name__)
 
+# Routes that read user.settings load it with the authenticated user in the same query
+_WITH_SETTINGS = (joinedload(User.settings),)
+
 # Validation schemas
 PROFILE_UPDATE_SCHEMA = {
     'type': 'object',
@@ -29,6 +34,9 @@ PROFILE_UPDATE_SCHEMA = {
     }
 }
 
+# Fields a client may change through PUT /profile
+UPDATABLE_PROFILE_FIELDS = frozenset({'first_name', 'last_name', 'username', 'email', 'bio', 'location', 'website'})
+
 PASSWORD_CHANGE_SCHEMA = {
     'type': 'object',
     'required': ['current_password', 'new_password'],
@@ -38,9 +46,27 @@ PASSWORD_CHANGE_SCHEMA = {
     }
 }
 
+def build_profile_dict(user, settings):
+    """Build the profile response payload for a user and their settings"""
+    return {
+        'id': user.id,
+        'username': user.username,
+        'email': user.email,
+        'first_name': user.first_name,
+        'last_name': user.last_name,
+        'bio': getattr(user, 'bio', ''),
+        'location': getattr(user, 'location', ''),
+        'website': getattr(user, 'website', ''),
+        'profile_picture': getattr(user, 'profile_picture', None),
+        'created_at': user.created_at.isoformat() if user.created_at else None,
+        'last_login': user.last_login.isoformat() if user.last_login else None,
+        'is_verified': getattr(user, 'is_verified', False),
+        'settings': settings.to_json_fragment() if settings else None
+    }
+
 @api_bp.route('/profile', methods=['GET'])
 @rate_limit('/api/profile')
-@auth_required
+@auth_required(load_options=_WITH_SETTINGS)
 def get_profile():
     """Get user profile information"""
     try:
@@ -55,25 +81,10 @@ def get_profile():
         
         logger.info(f"Getting profile for user {user.id}")
         
-        # Get user settings
-        settings = UserSettings.get_or_create_settings(user.id)
-        
-        # Build profile data
-        profile_data = {
-            'id': user.id,
-            'username': user.username,
-            'email': user.email,
-            'first_name': user.first_name,
-            'last_name': user.last_name,
-            'bio': getattr(user, 'bio', ''),
-            'location': getattr(user, 'location', ''),
-            'website': getattr(user, 'website', ''),
-            'profile_picture': getattr(user, 'profile_picture', None),
-            'created_at': user.created_at.isoformat() if user.created_at else None,
-            'last_login': user.last_login.isoformat() if user.last_login else None,
-            'is_verified': getattr(user, 'is_verified', False),
-            'settings': settings.to_dict() if settings else None
-        }
+        # Settings are joined-loaded with the authenticated user; only create them the first time
+        settings = user.settings or UserSettings.get_or_create_settings(user.id)
+        
+        profile_data = build_profile_dict(user, settings)
         
         return jsonify({
             "profile": profile_data,
@@ -91,7 +102,7 @@ def get_profile():
 
 @api_bp.route('/profile', methods=['PUT'])
 @rate_limit('/api/profile')
-@auth_required
+@auth_required(load_options=_WITH_SETTINGS)
 @validate_json_input(PROFILE_UPDATE_SCHEMA)
 def update_profile():
     """Update user profile information"""
@@ -117,19 +128,24 @@ def update_profile():
         logger.info(f"Updating profile for user {user.id}")
         
         # Check if username or email is being changed and if they're already taken
-        if 'username' in data and data['username'] != user.username:
-            existing_user = User.query.filter_by(username=data['username']).first()
-            if existing_user:
+        new_username = data['username'] if 'username' in data and data['username'] != user.username else None
+        new_email = data['email'] if 'email' in data and data['email'] != user.email else None
+        
+        if new_username is not None or new_email is not None:
+            # Pure existence probes: one round-trip returning two booleans, no User rows hydrated
+            username_probe = exists().where(User.username == new_username) if new_username is not None else false()
+            email_probe = exists().where(User.email == new_email) if new_email is not None else false()
+            username_taken, email_taken = db.session.execute(select(username_probe, email_probe)).one()
+            
+            if username_taken:
                 return jsonify({
                     "error": "Username Taken",
                     "message": "Username is already taken",
                     "status": "error",
                     "code": "USERNAME_EXISTS"
                 }), 400
-        
-        if 'email' in data and data['email'] != user.email:
-            existing_user = User.query.filter_by(email=data['email']).first()
-            if existing_user:
+            
+            if email_taken:
                 return jsonify({
                     "error": "Email Taken",
                     "message": "Email is already registered",
@@ -138,33 +154,15 @@ def update_profile():
                 }), 400
         
         # Update user fields
-        updatable_fields = ['first_name', 'last_name', 'username', 'email', 'bio', 'location', 'website']
-        
-        for field in updatable_fields:
-            if field in data:
-                setattr(user, field, data[field])
+        for field in UPDATABLE_PROFILE_FIELDS & data.keys():
+            setattr(user, field, data[field])
         
         db.session.commit()
         
         # Get updated settings
-        settings = UserSettings.get_or_create_settings(user.id)
-        
-        # Build updated profile data
-        profile_data = {
-            'id': user.id,
-            'username': user.username,
-            'email': user.email,
-            'first_name': user.first_name,
-            'last_name': user.last_name,
-            'bio': getattr(user, 'bio', ''),
-            'location': getattr(user, 'location', ''),
-            'website': getattr(user, 'website', ''),
-            'profile_picture': getattr(user, 'profile_picture', None),
-            'created_at': user.created_at.isoformat() if user.created_at else None,
-            'last_login': user.last_login.isoformat() if user.last_login else None,
-            'is_verified': getattr(user, 'is_verified', False),
-            'settings': settings.to_dict() if settings else None
-        }
+        settings = user.settings or UserSettings.get_or_create_settings(user.id)
+        
+        profile_data = build_profile_dict(user, settings)
         
         return jsonify({
             "profile": profile_data,
@@ -210,7 +208,7 @@ def change_password():
         logger.info(f"Changing password for user {user.id}")
         
         # Verify current password
-        if not check_password_hash(user.password_hash, data['current_password']):
+        if not user.check_password(data['current_password']):
             return jsonify({
                 "error": "Invalid Password",
                 "message": "Current password is incorrect",
@@ -228,8 +226,8 @@ def change_password():
                 "code": "PASSWORD_TOO_SHORT"
             }), 400
         
-        # Check if new password is different from current
-        if check_password_hash(user.password_hash, new_password):
+        # The current password was just verified, so compare plaintexts instead of running the KDF again
+        if hmac.compare_digest(new_password.encode('utf-8'), data['current_password'].encode('utf-8')):
             return jsonify({
                 "error": "Same Password",
                 "message": "New password must be different from current password",
@@ -238,7 +236,7 @@ def change_password():
             }), 400
         
         # Update password
-        user.password_hash = generate_password_hash(new_password)
+        user.set_password(new_password)
         db.session.commit()
         
         return jsonify({
@@ -313,7 +311,7 @@ def delete_account():
             }), 400
         
         # Verify password
-        if not check_password_hash(user.password_hash, data['password']):
+        if not user.check_password(data['password']):
             return jsonify({
                 "error": "Invalid Password",
                 "message": "Password is incorrect",
@@ -372,16 +370,28 @@ def get_profile_stats():
         from models.price_alert import PriceAlert
         from models.search_history import SearchHistory
         
-        # Calculate statistics
-        saved_items_count = SavedItem.query.filter_by(user_id=user.id).count()
-        portfolio_items_count = PortfolioItem.query.filter_by(user_id=user.id).count()
-        active_alerts_count = PriceAlert.query.filter_by(user_id=user.id, is_active=True).count()
-        searches_count = SearchHistory.query.filter_by(user_id=user.id).count()
-        
-        # Calculate portfolio value (mock calculation)
-        portfolio_items = PortfolioItem.query.filter_by(user_id=user.id).all()
-        total_investment = sum(float(item.purchase_price) for item in portfolio_items)
-        estimated_value = sum(float(item.current_market_price or item.purchase_price) for item in portfolio_items)
+        # All counts and portfolio sums as scalar subqueries of a single round-trip
+        def user_count(model, *criteria):
+            return select(func.count()).select_from(model).where(model.user_id == user.id, *criteria).scalar_subquery()
+        
+        def portfolio_sum(expr):
+            return select(func.sum(expr)).where(PortfolioItem.user_id == user.id).scalar_subquery()
+        
+        row = db.session.execute(select(
+            user_count(SavedItem).label('saved'),
+            user_count(PortfolioItem).label('portfolio'),
+            user_count(PriceAlert, PriceAlert.is_active.is_(True)).label('alerts'),
+            user_count(SearchHistory).label('searches'),
+            portfolio_sum(PortfolioItem.purchase_price).label('investment'),
+            portfolio_sum(func.coalesce(func.nullif(PortfolioItem.current_market_price, 0), PortfolioItem.purchase_price)).label('estimated')
+        )).one()
+        
+        saved_items_count = row.saved
+        portfolio_items_count = row.portfolio
+        active_alerts_count = row.alerts
+        searches_count = row.searches
+        total_investment = float(row.investment or 0)
+        estimated_value = float(row.estimated or 0)
         
         stats = {
             'saved_items': saved_items_count,
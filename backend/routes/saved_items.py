@@ -1,357 +1,293 @@
-from flask import jsonify, request, g
+from flask import jsonify, request, g, current_app
 from . import api_bp
 from utils.rate_limiter import rate_limit
 from utils.auth_middleware import auth_required, get_current_user
+from utils.validation import validate_pagination_params
+from utils.pagination import encode_cursor, decode_cursor
 from models.saved_item import SavedItem
 from models.search_history import SearchHistory
 from models.database import db
+from sqlalchemy import func, select, tuple_
 import logging
-import re
-from datetime import datetime
-from werkzeug.exceptions import BadRequest
+import math
+from utils.responses import StaticErrorResponses
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Fields POST /saved-items requires, in the order they are reported when missing
+SAVE_ITEM_REQUIRED_FIELDS = ('item_id', 'title', 'price')
+_SAVE_ITEM_REQUIRED_SET = frozenset(SAVE_ITEM_REQUIRED_FIELDS)
+
+def build_saved_item_data(data, item_id):
+    """Build SavedItem column values from a POST body that has all required fields"""
+    # Length caps and defaults are inlined so this runs as straight-line code per request
+    return {
+        'ebay_item_id': item_id,
+        'title': str(data['title']).strip()[:500],
+        'price': float(data['price']),
+        'currency': data.get('currency', 'USD'),
+        'image_url': data.get('image_url', ''),
+        'item_url': data.get('item_url', ''),
+        'condition': data.get('condition', 'Unknown'),
+        'location': data.get('location', 'Unknown'),
+        'notes': data.get('notes', '')[:1000]
+    }
+
+# Fields PUT /saved-items/<item_id> may change
+UPDATABLE_SAVED_ITEM_FIELDS = ('title', 'price', 'currency', 'image_url', 'item_url', 'condition', 'location', 'notes')
+
+def find_user_saved_item(user_id, item_id):
+    """Look up one of a user's saved items by its eBay item ID, or None"""
+    return SavedItem.query.filter_by(user_id=user_id, ebay_item_id=item_id).first()
+
+# Saved-items listing (newest first) as plain rows; requests only add their WHERE clauses and LIMIT/OFFSET
+_SAVED_ITEMS_LIST_STMT = select(SavedItem.__table__).order_by(SavedItem.created_at.desc(), SavedItem.id.desc())
+
+# Constant error responses, serialized once at import time
+_error_response = StaticErrorResponses(
+    (400, {"error": "Invalid Cursor", "message": "Pagination cursor is invalid", "status": "error", "code": "INVALID_CURSOR"}),
+    (400, {"error": "Invalid Item ID", "message": "Item ID must be between 1 and 50 characters.", "status": "error", "code": "INVALID_ITEM_ID"}),
+    (400, {"error": "Invalid JSON", "message": "Request body contains invalid JSON.", "status": "error", "code": "INVALID_JSON"}),
+    (400, {"error": "Missing JSON body", "message": "Request body must be valid JSON.", "status": "error", "code": "MISSING_JSON"}),
+    (404, {"error": "Item Not Found", "message": "Item not found.", "status": "error", "code": "ITEM_NOT_FOUND"}),
+    (415, {"error": "Invalid Content-Type", "message": "Content-Type must be application/json", "status": "error", "code": "INVALID_CONTENT_TYPE"})
+)
+
 @api_bp.route('/saved-items', methods=['GET'])
 @rate_limit('/api/saved-items')
 @auth_required
 def get_saved_items():
     """Get user's saved items"""
-    try:
-        user = get_current_user()
-        logger.info(f"GET saved items request from user {user.username}")
-
-        # Get query parameters for filtering and pagination
-        page = request.args.get('page', 1, type=int)
-        per_page = min(request.args.get('per_page', 20, type=int), 100)  # Max 100 items per page
-        status = request.args.get('status')  # Filter by status
-        tag = request.args.get('tag')  # Filter by tag
-
-        # Build query
-        query = SavedItem.query.filter_by(user_id=user.id)
+    user = get_current_user()
+    logger.info("GET saved items request from user %s", user.username)
 
-        if status:
-            query = query.filter_by(status=status)
+    # Get query parameters for filtering and pagination
+    page, per_page = validate_pagination_params(request.args.get('page'), request.args.get('per_page'))
+    status = request.args.get('status')  # Filter by status
+    tag = request.args.get('tag')  # Filter by tag
 
-        if tag:
-            query = query.filter(SavedItem.tags.contains(tag))
+    # Build filters on top of the shared base statement
+    filters = [SavedItem.user_id == user.id]
 
-        # Order by creation date (newest first)
-        query = query.order_by(SavedItem.created_at.desc())
+    if status:
+        filters.append(SavedItem.status == status)
 
-        # Paginate results
-        pagination = query.paginate(
-            page=page,
-            per_page=per_page,
-            error_out=False
-        )
+    if tag:
+        filters.append(SavedItem.tags.contains(tag))
 
-        items = [item.to_dict() for item in pagination.items]
+    cursor = request.args.get('cursor')
+    if cursor:
+        # Keyset pagination: seek past the cursor instead of counting and skipping rows
+        try:
+            cursor_created_at, cursor_id = decode_cursor(cursor)
+        except ValueError:
+            return _error_response('INVALID_CURSOR')
 
-        logger.info(f"Retrieved {len(items)} saved items for user {user.username}")
+        rows = db.session.execute(
+            _SAVED_ITEMS_LIST_STMT.where(
+                *filters, tuple_(SavedItem.created_at, SavedItem.id) < (cursor_created_at, cursor_id)
+            ).limit(per_page + 1)
+        ).all()
 
-        return jsonify({
-            "items": items,
-            "total": pagination.total,
+        items = rows[:per_page]
+        has_next = len(rows) > per_page
+        pagination_data = {
+            "per_page": per_page,
+            "has_next": has_next,
+            "next_cursor": encode_cursor(items[-1].created_at, items[-1].id) if has_next else None
+        }
+    else:
+        # Page/offset pagination, kept for existing clients
+        total = db.session.scalar(select(func.count()).select_from(SavedItem).where(*filters))
+        items = db.session.execute(
+            _SAVED_ITEMS_LIST_STMT.where(*filters).limit(per_page).offset((page - 1) * per_page)
+        ).all()
+        pages = math.ceil(total / per_page)
+        has_next = page < pages
+        pagination_data = {
+            "total": total,
             "page": page,
             "per_page": per_page,
-            "pages": pagination.pages,
-            "has_next": pagination.has_next,
-            "has_prev": pagination.has_prev,
-            "status": "success"
-        }), 200
+            "pages": pages,
+            "has_next": has_next,
+            "has_prev": page > 1,
+            # Lets clients switch to cursor pagination for the following pages
+            "next_cursor": encode_cursor(items[-1].created_at, items[-1].id) if has_next and items else None
+        }
 
-    except Exception as e:
-        logger.error(f"Error retrieving saved items: {str(e)}", exc_info=True)
-        return jsonify({
-            "error": "Internal Server Error",
-            "message": "Failed to retrieve saved items",
-            "status": "error",
-            "code": "INTERNAL_SERVER_ERROR"
-        }), 500
+    logger.info("Retrieved %s saved items for user %s", len(items), user.username)
+
+    # Stream items one at a time instead of building the full list and body in memory
+    return current_app.json.stream_response(
+        {**pagination_data, "status": "success"}, "items", items, to_json=SavedItem.row_to_json_bytes
+    ), 200
 
 @api_bp.route('/saved-items', methods=['POST'])
 @rate_limit('/api/saved-items')
 @auth_required
 def save_item():
     """Save an item to user's favorites"""
-    try:
-        user = get_current_user()
-        logger.info(f"POST save item request from user {user.username}")
-        
-        # Check Content-Type
-        if not request.is_json:
-            logger.warning("Request Content-Type is not application/json")
-            return jsonify({
-                "error": "Invalid Content-Type",
-                "message": "Content-Type must be application/json",
-                "status": "error",
-                "code": "INVALID_CONTENT_TYPE"
-            }), 415
-        
-        # Parse JSON body
-        try:
-            data = request.get_json()
-        except BadRequest as e:
-            logger.warning(f"Invalid JSON: {str(e)}")
-            return jsonify({
-                "error": "Invalid JSON",
-                "message": "Request body contains invalid JSON.",
-                "status": "error",
-                "code": "INVALID_JSON"
-            }), 400
-        
-        if not data:
-            logger.warning("Save item request missing JSON data")
-            return jsonify({
-                "error": "Missing JSON body",
-                "message": "Request body must be valid JSON.",
-                "status": "error",
-                "code": "MISSING_JSON"
-            }), 400
-        
-        # Validate required fields
-        required_fields = ['item_id', 'title', 'price']
-        missing_fields = [field for field in required_fields if field not in data]
-        
-        if missing_fields:
-            logger.warning(f"Save item request missing required fields: {missing_fields}")
-            return jsonify({
-                "error": "Missing Required Fields",
-                "message": f"Missing required fields: {', '.join(missing_fields)}",
-                "status": "error",
-                "code": "MISSING_FIELDS"
-            }), 400
-        
-        item_id = data['item_id'].strip()
-        
-        # Validate item_id format
-        if not item_id or len(item_id) > 50:
-            logger.warning(f"Invalid item_id: {item_id}")
-            return jsonify({
-                "error": "Invalid Item ID",
-                "message": "Item ID must be between 1 and 50 characters.",
-                "status": "error",
-                "code": "INVALID_ITEM_ID"
-            }), 400
-        
-        # Prepare item data for database
-        item_data = {
-            'ebay_item_id': str(data['item_id']).strip(),
-            'title': str(data['title']).strip()[:500],
-            'price': float(data['price']),
-            'currency': data.get('currency', 'USD'),
-            'image_url': data.get('image_url', ''),
-            'item_url': data.get('item_url', ''),
-            'condition': data.get('condition', 'Unknown'),
-            'location': data.get('location', 'Unknown'),
-            'notes': data.get('notes', '')[:1000]
-        }
+    user = get_current_user()
+    logger.info("POST save item request from user %s", user.username)
+    
+    # Check Content-Type
+    if not request.is_json:
+        logger.warning("Request Content-Type is not application/json")
+        return _error_response('INVALID_CONTENT_TYPE')
+    
+    # Parse JSON body; silent=True returns None on malformed JSON instead of raising
+    data = request.get_json(silent=True)
+    if data is None:
+        logger.warning("Request body contains invalid JSON")
+        return _error_response('INVALID_JSON')
+    
+    if not data:
+        logger.warning("Save item request missing JSON data")
+        return _error_response('MISSING_JSON')
+    
+    # Validate required fields with one set comparison; only build the ordered list on failure
+    if not isinstance(data, dict) or not data.keys() >= _SAVE_ITEM_REQUIRED_SET:
+        missing_fields = [field for field in SAVE_ITEM_REQUIRED_FIELDS if field not in data]
+        logger.warning("Save item request missing required fields: %s", missing_fields)
+        return jsonify({
+            "error": "Missing Required Fields",
+            "message": f"Missing required fields: {', '.join(missing_fields)}",
+            "status": "error",
+            "code": "MISSING_FIELDS"
+        }), 400
+    
+    item_id = str(data['item_id']).strip()
+    
+    # Validate item_id format
+    if not item_id or len(item_id) > 50:
+        logger.warning("Invalid item_id: %s", item_id)
+        return _error_response('INVALID_ITEM_ID')
+    
+    # Prepare item data for database
+    item_data = build_saved_item_data(data, item_id)
 
-        # Create saved item
-        try:
-            saved_item = SavedItem.create_saved_item(user.id, item_data)
+    # Create saved item
+    try:
+        saved_item = SavedItem.create_saved_item(user.id, item_data)
 
-            logger.info(f"Item {saved_item.ebay_item_id} saved successfully for user {user.username}")
+        logger.info("Item %s saved successfully for user %s", saved_item.ebay_item_id, user.username)
 
-            return jsonify({
-                "message": "Item saved successfully",
-                "item": saved_item.to_dict(),
-                "status": "success"
-            }), 201
+        return jsonify({
+            "message": "Item saved successfully",
+            "item": saved_item.to_dict(),
+            "status": "success"
+        }), 201
 
-        except ValueError as e:
-            return jsonify({
-                "error": "Item Already Saved",
-                "message": str(e),
-                "status": "error",
-                "code": "ITEM_ALREADY_SAVED"
-            }), 409
-        
-    except Exception as e:
-        logger.error(f"Error saving item: {str(e)}", exc_info=True)
+    except ValueError as e:
         return jsonify({
-            "error": "Internal Server Error",
-            "message": "Failed to save item",
+            "error": "Item Already Saved",
+            "message": str(e),
             "status": "error",
-            "code": "INTERNAL_SERVER_ERROR"
-        }), 500
+            "code": "ITEM_ALREADY_SAVED"
+        }), 409
 
 @api_bp.route('/saved-items/<item_id>', methods=['GET'])
 @rate_limit('/api/saved-items')
+@auth_required
 def get_saved_item(item_id):
     """Get a specific saved item by ID"""
-    try:
-        logger.info(f"GET saved item {item_id} request from {request.remote_addr}")
-        
-        # Validate item_id
-        if not item_id or len(item_id) > 50:
-            return jsonify({
-                "error": "Invalid Item ID",
-                "message": "Item ID must be between 1 and 50 characters.",
-                "status": "error",
-                "code": "INVALID_ITEM_ID"
-            }), 400
-        
-        # Check if item exists
-        if item_id not in saved_items_storage:
-            logger.warning(f"Item {item_id} not found")
-            return jsonify({
-                "error": "Item Not Found",
-                "message": "Item not found.",
-                "status": "error",
-                "code": "ITEM_NOT_FOUND"
-            }), 404
-        
-        item = saved_items_storage[item_id]
-        logger.info(f"Retrieved item {item_id}")
-        
-        return jsonify({
-            "item": item,
-            "status": "success"
-        }), 200
-        
-    except Exception as e:
-        logger.error(f"Error retrieving item {item_id}: {str(e)}", exc_info=True)
-        return jsonify({
-            "error": "Internal Server Error",
-            "message": "Failed to retrieve item",
-            "status": "error",
-            "code": "INTERNAL_SERVER_ERROR"
-        }), 500
+    user = get_current_user()
+    logger.info("GET saved item %s request from user %s", item_id, user.username)
+    
+    # Validate item_id
+    if not item_id or len(item_id) > 50:
+        return _error_response('INVALID_ITEM_ID')
+    
+    # Check if item exists
+    item = find_user_saved_item(user.id, item_id)
+    if item is None:
+        logger.warning("Item %s not found", item_id)
+        return _error_response('ITEM_NOT_FOUND')
+    
+    logger.info("Retrieved item %s", item_id)
+    
+    return jsonify({
+        "item": item.to_dict(),
+        "status": "success"
+    }), 200
 
 @api_bp.route('/saved-items/<item_id>', methods=['PUT'])
 @rate_limit('/api/saved-items')
+@auth_required
 def update_saved_item(item_id):
     """Update a saved item"""
-    try:
-        logger.info(f"PUT update item {item_id} request from {request.remote_addr}")
-        
-        # Check Content-Type
-        if not request.is_json:
-            logger.warning("Request Content-Type is not application/json")
-            return jsonify({
-                "error": "Invalid Content-Type",
-                "message": "Content-Type must be application/json",
-                "status": "error",
-                "code": "INVALID_CONTENT_TYPE"
-            }), 415
-        
-        # Parse JSON body
-        try:
-            data = request.get_json()
-        except BadRequest as e:
-            logger.warning(f"Invalid JSON: {str(e)}")
-            return jsonify({
-                "error": "Invalid JSON",
-                "message": "Request body contains invalid JSON.",
-                "status": "error",
-                "code": "INVALID_JSON"
-            }), 400
-        
-        if not data:
-            return jsonify({
-                "error": "Missing JSON body",
-                "message": "Request body must be valid JSON.",
-                "status": "error",
-                "code": "MISSING_JSON"
-            }), 400
-        
-        # Validate item_id
-        if not item_id or len(item_id) > 50:
-            return jsonify({
-                "error": "Invalid Item ID",
-                "message": "Item ID must be between 1 and 50 characters.",
-                "status": "error",
-                "code": "INVALID_ITEM_ID"
-            }), 400
-        
-        # Check if item exists
-        if item_id not in saved_items_storage:
-            logger.warning(f"Item {item_id} not found for update")
-            return jsonify({
-                "error": "Item Not Found",
-                "message": "Item not found.",
-                "status": "error",
-                "code": "ITEM_NOT_FOUND"
-            }), 404
-        
-        # Update allowed fields
-        item = saved_items_storage[item_id]
-        allowed_fields = ['title', 'price', 'currency', 'image_url', 'item_url', 'condition', 'location', 'notes']
-        
-        for field in allowed_fields:
-            if field in data:
-                if field == 'title':
-                    item[field] = data[field][:200]  # Limit title length
-                elif field == 'notes':
-                    item[field] = data[field][:500]  # Limit notes length
-                else:
-                    item[field] = data[field]
-        
-        # Update timestamp
-        item['updated_at'] = datetime.utcnow().isoformat()
-        
-        logger.info(f"Item {item_id} updated successfully")
-        
-        return jsonify({
-            "message": "Item updated successfully",
-            "item": item,
-            "status": "success"
-        }), 200
-        
-    except Exception as e:
-        logger.error(f"Error updating item {item_id}: {str(e)}", exc_info=True)
-        return jsonify({
-            "error": "Internal Server Error",
-            "message": "Failed to update item",
-            "status": "error",
-            "code": "INTERNAL_SERVER_ERROR"
-        }), 500
+    user = get_current_user()
+    logger.info("PUT update item %s request from user %s", item_id, user.username)
+    
+    # Check Content-Type
+    if not request.is_json:
+        logger.warning("Request Content-Type is not application/json")
+        return _error_response('INVALID_CONTENT_TYPE')
+    
+    # Parse JSON body; silent=True returns None on malformed JSON instead of raising
+    data = request.get_json(silent=True)
+    if data is None:
+        logger.warning("Request body contains invalid JSON")
+        return _error_response('INVALID_JSON')
+    
+    if not data:
+        return _error_response('MISSING_JSON')
+    
+    # Validate item_id
+    if not item_id or len(item_id) > 50:
+        return _error_response('INVALID_ITEM_ID')
+    
+    # Check if item exists
+    item = find_user_saved_item(user.id, item_id)
+    if item is None:
+        logger.warning("Item %s not found for update", item_id)
+        return _error_response('ITEM_NOT_FOUND')
+    
+    # Update allowed fields
+    updates = {field: data[field] for field in UPDATABLE_SAVED_ITEM_FIELDS if field in data}
+    if 'title' in updates:
+        updates['title'] = updates['title'][:200]  # Limit title length
+    if 'notes' in updates:
+        updates['notes'] = updates['notes'][:500]  # Limit notes length
+    if 'price' in updates:
+        updates['price'] = float(updates['price'])
+    
+    item.update_item(updates)
+    
+    logger.info("Item %s updated successfully", item_id)
+    
+    return jsonify({
+        "message": "Item updated successfully",
+        "item": item.to_dict(),
+        "status": "success"
+    }), 200
 
 @api_bp.route('/saved-items/<item_id>', methods=['DELETE'])
 @rate_limit('/api/saved-items')
+@auth_required
 def delete_saved_item(item_id):
     """Delete a saved item"""
-    try:
-        logger.info(f"DELETE item {item_id} request from {request.remote_addr}")
-        
-        # Validate item_id
-        if not item_id or len(item_id) > 50:
-            return jsonify({
-                "error": "Invalid Item ID",
-                "message": "Item ID must be between 1 and 50 characters.",
-                "status": "error",
-                "code": "INVALID_ITEM_ID"
-            }), 400
-        
-        # Check if item exists
-        if item_id not in saved_items_storage:
-            logger.warning(f"Item {item_id} not found for deletion")
-            return jsonify({
-                "error": "Item Not Found",
-                "message": "Item not found.",
-                "status": "error",
-                "code": "ITEM_NOT_FOUND"
-            }), 404
-        
-        # Remove item
-        deleted_item = saved_items_storage.pop(item_id)
-        
-        logger.info(f"Item {item_id} deleted successfully")
-        
-        return jsonify({
-            "message": "Item deleted successfully",
-            "deleted_item": deleted_item,
-            "status": "success"
-        }), 200
-        
-    except Exception as e:
-        logger.error(f"Error deleting item {item_id}: {str(e)}", exc_info=True)
-        return jsonify({
-            "error": "Internal Server Error",
-            "message": "Failed to delete item",
-            "status": "error",
-            "code": "INTERNAL_SERVER_ERROR"
-        }), 500 
\ No newline at end of file
+    user = get_current_user()
+    logger.info("DELETE item %s request from user %s", item_id, user.username)
+    
+    # Validate item_id
+    if not item_id or len(item_id) > 50:
+        return _error_response('INVALID_ITEM_ID')
+    
+    # Remove item if it exists
+    item = find_user_saved_item(user.id, item_id)
+    if item is None:
+        logger.warning("Item %s not found for deletion", item_id)
+        return _error_response('ITEM_NOT_FOUND')
+    
+    deleted_item = item.to_dict()
+    item.delete_item()
+    
+    logger.info("Item %s deleted successfully", item_id)
+    
+    return jsonify({
+        "message": "Item deleted successfully",
+        "deleted_item": deleted_item,
+        "status": "success"
+    }), 200
\ No newline at end of file
@@ -4,166 +4,196 @@ from services.ebay_service import EbayService
 from utils.rate_limiter import rate_limit
 from utils.security import InputValidation, SecurityValidator
 from utils.auth_middleware import auth_optional, get_current_user
+from utils.responses import StaticErrorResponses
 from models.search_history import SearchHistory
+from cachetools import TLRUCache
 import logging
+import threading
+from concurrent.futures import Future
 from datetime import datetime
+from functools import lru_cache
+from typing import Optional
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Constant error responses, serialized once at import time
+_error_response = StaticErrorResponses(
+    (400, {"error": "Invalid Limit", "message": "Limit must be between 1 and 100.", "status": "error", "code": "INVALID_LIMIT"}),
+    (400, {"error": "Invalid Limit Type", "message": "Limit must be a valid number.", "status": "error", "code": "INVALID_LIMIT_TYPE"}),
+    (400, {"error": "Invalid Query Format", "message": "Query contains invalid characters", "status": "error", "code": "INVALID_QUERY_FORMAT"}),
+    (400, {"error": "Missing Query", "message": "Query parameter 'q' is required.", "status": "error", "code": "MISSING_QUERY"}),
+    (400, {"error": "Invalid Request", "message": "Validated data not found. Input validation failed.", "status": "error", "code": "VALIDATION_ERROR"})
+)
+
+# eBay search results keyed by (query, limit). Listings change over minutes, so successful
+# results live for SEARCH_CACHE_TTL; errors are negative-cached briefly so an outage or upstream
+# rate limit isn't hammered by every retrying client, but recovers within seconds
+SEARCH_CACHE_TTL = 300
+SEARCH_ERROR_CACHE_TTL = 5
+_search_cache = TLRUCache(
+    maxsize=10_000,
+    ttu=lambda _key, result, now: now + (SEARCH_ERROR_CACHE_TTL if 'error' in result else SEARCH_CACHE_TTL)
+)
+_search_cache_lock = threading.Lock()
+# Futures for eBay searches currently running, keyed like _search_cache and guarded by its lock
+_inflight_searches = {}
+# Guards construction of the app's shared EbayService
+_ebay_service_lock = threading.Lock()
+
+@lru_cache(maxsize=4096)
+def _validate_and_sanitize_query(query: str) -> Optional[str]:
+    """Validate and sanitize a search query, or None if invalid (memoized; both steps are pure)"""
+    if not SecurityValidator.validate_string(query, 'query', max_length=100):
+        return None
+    return SecurityValidator.sanitize_string(query)
+
+def get_ebay_service():
+    """Return the app's shared EbayService, creating it on first use"""
+    # Built lazily because EbayService reads app config; it holds no per-request state
+    service = current_app.extensions.get('ebay_service')
+    if service is None:
+        with _ebay_service_lock:
+            # Re-check so concurrent first requests don't each validate the key and build a session
+            service = current_app.extensions.get('ebay_service')
+            if service is None:
+                service = current_app.extensions['ebay_service'] = EbayService()
+    return service
+
+def _search_with_cache(query, limit):
+    """Search eBay for query, reusing a recent result for the same query and limit"""
+    key = (query, limit)
+    with _search_cache_lock:
+        cached = _search_cache.get(key)
+        if cached is not None:
+            return cached
+
+        # Single-flight: concurrent identical searches wait on the first one's upstream call
+        future = _inflight_searches.get(key)
+        is_leader = future is None
+        if is_leader:
+            future = _inflight_searches[key] = Future()
+
+    if not is_leader:
+        return future.result()
+
+    try:
+        result = get_ebay_service().search_items(query, limit)
+    except BaseException as e:
+        with _search_cache_lock:
+            del _inflight_searches[key]
+        future.set_exception(e)
+        raise
+
+    with _search_cache_lock:
+        del _inflight_searches[key]
+        _search_cache[key] = result
+    future.set_result(result)
+    return result
+
 @api_bp.route('/search', methods=['POST'])
 @rate_limit('/api/search')
 @auth_optional
 @InputValidation.validate_search_input
 def search_items():
     """Search for items using eBay Finding API with enhanced security"""
-    try:
-        # Get validated and sanitized data from request
-        data = getattr(g, 'validated_json', None)
-        if not data:
-            return jsonify({
-                "error": "Invalid Request",
-                "message": "Validated data not found. Input validation failed.",
-                "status": "error",
-                "code": "VALIDATION_ERROR"
-            }), 400
-        query = data['query']
-        limit = data['limit']
-        
-        logger.info(f"Processing search request: '{query}' (limit: {limit})")
-
-        # Track search start time
-        search_start_time = datetime.utcnow()
-
-        # Perform search using enhanced eBay service
-        ebay_service = EbayService()
-        result = ebay_service.search_items(query, limit)
-
-        # Track search history if user is authenticated
-        user = get_current_user()
-        if user:
-            try:
-                search_record = SearchHistory.create_search_record(
-                    user_id=user.id,
-                    query=query,
-                    search_start_time=search_start_time,
-                    limit_requested=limit
-                )
-
-                # Analyze results if we got any
-                if result.get('results'):
-                    search_record.analyze_results(result['results'])
-
-            except Exception as e:
-                logger.warning(f"Failed to record search history: {str(e)}")
-
-        # Check for service errors
-        if 'error' in result:
-            logger.error(f"eBay service error: {result['error']}")
-            return jsonify({
-                "error": result['error'],
-                "message": result.get('message', 'Service temporarily unavailable'),
-                "status": "error",
-                "code": "EBAY_SERVICE_ERROR"
-            }), 503
-
-        logger.info(f"Search completed successfully. Found {result.get('total', 0)} items")
-
-        return jsonify({
-            "results": result.get('results', []),
-            "total": result.get('total', 0),
-            "query": query,
-            "limit": limit,
-            "status": "success"
-        }), 200
-
-    except Exception as e:
-        logger.error(f"Unexpected error in search endpoint: {str(e)}", exc_info=True)
+    # Get validated and sanitized data from request
+    data = getattr(g, 'validated_json', None)
+    if not data:
+        return _error_response('VALIDATION_ERROR')
+    query = data['query']
+    limit = data['limit']
+    
+    logger.info("Processing search request: '%s' (limit: %s)", query, limit)
+
+    # Track search start time
+    search_start_time = datetime.utcnow()
+
+    # Perform search using enhanced eBay service
+    result = _search_with_cache(query, limit)
+
+    # Track search history if user is authenticated
+    user = get_current_user()
+    if user:
+        try:
+            search_record = SearchHistory.create_search_record(
+                user_id=user.id,
+                query=query,
+                search_start_time=search_start_time,
+                limit_requested=limit
+            )
+
+            # Analyze results if we got any
+            if result.get('results'):
+                search_record.analyze_results(result['results'])
+
+        except Exception as e:
+            logger.warning("Failed to record search history: %s", e)
+
+    # Check for service errors
+    if 'error' in result:
+        logger.error("eBay service error: %s", result['error'])
         return jsonify({
-            "error": "Internal Server Error",
-            "message": "An unexpected error occurred.",
+            "error": result['error'],
+            "message": result.get('message', 'Service temporarily unavailable'),
             "status": "error",
-            "code": "INTERNAL_SERVER_ERROR"
-        }), 500
+            "code": "EBAY_SERVICE_ERROR"
+        }), 503
+
+    logger.info("Search completed successfully. Found %s items", result.get('total', 0))
+
+    return jsonify({
+        "results": result.get('results', []),
+        "total": result.get('total', 0),
+        "query": query,
+        "limit": limit,
+        "status": "success"
+    }), 200
 
 @api_bp.route('/search', methods=['GET'])
 @rate_limit('/api/search')
 def search_items_get():
     """Search for items using GET method (for simple queries) with validation"""
+    query = request.args.get('q')
+    limit = request.args.get('limit', 20)
+
+    if not query:
+        return _error_response('MISSING_QUERY')
+
+    # Validate and sanitize query format
+    sanitized_query = _validate_and_sanitize_query(query)
+    if sanitized_query is None:
+        return _error_response('INVALID_QUERY_FORMAT')
+    
+    # Validate limit
     try:
-        query = request.args.get('q')
-        limit = request.args.get('limit', 20)
-
-        if not query:
-            return jsonify({
-                "error": "Missing Query",
-                "message": "Query parameter 'q' is required.",
-                "status": "error",
-                "code": "MISSING_QUERY"
-            }), 400
-
-        # Validate query format
-        from utils.security import SecurityValidator
-        if not SecurityValidator.validate_string(query, 'query', max_length=100):
-            return jsonify({
-                "error": "Invalid Query Format",
-                "message": "Query contains invalid characters",
-                "status": "error",
-                "code": "INVALID_QUERY_FORMAT"
-            }), 400
-
-        # Sanitize query
-        sanitized_query = SecurityValidator.sanitize_string(query)
-        
-        # Validate limit
-        try:
-            limit = int(limit)
-            if limit < 1 or limit > 100:
-                return jsonify({
-                    "error": "Invalid Limit",
-                    "message": "Limit must be between 1 and 100.",
-                    "status": "error",
-                    "code": "INVALID_LIMIT"
-                }), 400
-        except (ValueError, TypeError):
-            return jsonify({
-                "error": "Invalid Limit Type",
-                "message": "Limit must be a valid number.",
-                "status": "error",
-                "code": "INVALID_LIMIT_TYPE"
-            }), 400
-
-        logger.info(f"Processing GET search request: '{sanitized_query}' (limit: {limit})")
-
-        # Perform search
-        ebay_service = EbayService()
-        result = ebay_service.search_items(sanitized_query, limit)
-
-        # Check for service errors
-        if 'error' in result:
-            logger.error(f"eBay service error: {result['error']}")
-            return jsonify({
-                "error": result['error'],
-                "message": result.get('message', 'Service temporarily unavailable'),
-                "status": "error",
-                "code": "EBAY_SERVICE_ERROR"
-            }), 503
-
-        logger.info(f"GET search completed successfully. Found {result.get('total', 0)} items")
+        limit = int(limit)
+        if limit < 1 or limit > 100:
+            return _error_response('INVALID_LIMIT')
+    except (ValueError, TypeError):
+        return _error_response('INVALID_LIMIT_TYPE')
 
+    logger.info("Processing GET search request: '%s' (limit: %s)", sanitized_query, limit)
+
+    # Perform search
+    result = _search_with_cache(sanitized_query, limit)
+
+    # Check for service errors
+    if 'error' in result:
+        logger.error("eBay service error: %s", result['error'])
         return jsonify({
-            "results": result.get('results', []),
-            "total": result.get('total', 0),
-            "query": sanitized_query,
-            "limit": limit,
-            "status": "success"
-        }), 200
-
-    except Exception as e:
-        logger.error(f"Error in GET search endpoint: {str(e)}", exc_info=True)
-        return jsonify({
-            "error": "Internal Server Error",
-            "message": "An unexpected error occurred.",
+            "error": result['error'],
+            "message": result.get('message', 'Service temporarily unavailable'),
             "status": "error",
-            "code": "INTERNAL_SERVER_ERROR"
-        }), 500 
\ No newline at end of file
+            "code": "EBAY_SERVICE_ERROR"
+        }), 503
+
+    logger.info("GET search completed successfully. Found %s items", result.get('total', 0))
+
+    return jsonify({
+        "results": result.get('results', []),
+        "total": result.get('total', 0),
+        "query": sanitized_query,
+        "limit": limit,
+        "status": "success"
+    }), 200
\ No newline at end of file
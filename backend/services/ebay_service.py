@@ -1,15 +1,78 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ReadTimeoutError
+from urllib3.util import Retry
 from flask import current_app
+from utils.circuit_breaker import CircuitBreaker
+from utils.token_bucket import TokenBucket
+import orjson
 import os
+import zlib
 import logging
-import time
 from typing import Dict, Any, Optional, List
 
 logger = logging.getLogger(__name__)
 
+# Enhanced key configuration and validation helpers; fall back to the Flask config when absent
+try:
+    from config.settings import Config
+    from utils.security import ApiKeySecurity, SecurityValidator
+    _HAS_CONFIG_HELPERS = True
+except ImportError:
+    _HAS_CONFIG_HELPERS = False
+
+# Shared by every EbayService so that, while eBay is down, searches fail fast instead of each
+# waiting out the full retry schedule; 5 consecutive failed calls open it for 60 seconds
+ebay_breaker = CircuitBreaker('ebay', fail_max=5, reset_timeout=60)
+
+# This worker's share of eBay's daily Finding API call quota (see Config.EBAY_DAILY_CALL_QUOTA),
+# refilled continuously, so a traffic spike is refused locally instead of running into 429s that
+# the retries would only amplify; the bucket banks only a few minutes of calls for bursts
+_daily_quota, _quota_workers, _burst_seconds = (
+    (Config.EBAY_DAILY_CALL_QUOTA, Config.EBAY_QUOTA_WORKERS, Config.EBAY_QUOTA_BURST_SECONDS)
+    if _HAS_CONFIG_HELPERS else (5000, 1, 300)
+)
+_quota_rate = _daily_quota / max(1, _quota_workers) / 86400
+ebay_quota = TokenBucket('ebay', rate=_quota_rate, capacity=max(1.0, _quota_rate * _burst_seconds))
+
+# Longest single wait between eBay retries, including waits requested via Retry-After
+RETRY_BACKOFF_MAX = 10
+
+class _CappedRetry(Retry):
+    """urllib3 Retry that never sleeps longer than backoff_max, even when Retry-After asks for more"""
+
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        return None if retry_after is None else min(retry_after, self.backoff_max)
+
+def _extract_safe_string(value: Any) -> str:
+    """Extract and sanitize a string value from an eBay response field (a list holding one value, or the value)"""
+    if isinstance(value, list):
+        value = value[0] if value else ''
+    # Strip and limit length
+    return value.strip()[:500] if isinstance(value, str) else ''
+
+def _parse_price(value: Any) -> Optional[float]:
+    """Parse an item price as a float, or None if it isn't a number"""
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
 class EbayService:
     """Service class for eBay Finding API integration with enhanced security"""
     
+    # Potentially dangerous query characters, removed in a single str.translate pass
+    SANITIZE_TABLE = str.maketrans('', '', '<>"\'&;|`$(){}')
+
+    # Lowercased item conditions that raise the confidence score
+    NEW_CONDITIONS = frozenset({'new', 'new with tags', 'new without tags'})
+    GOOD_CONDITIONS = frozenset({'excellent', 'very good', 'good'})
+
+    # Rotating field values for mock search results
+    MOCK_CONDITIONS = ('New', 'Used', 'Excellent', 'Good')
+    MOCK_MARKET_POSITIONS = ('low', 'average', 'moderate', 'high')
+    
     def __init__(self):
         # Validate API key configuration with enhanced security
         self.app_id = self._validate_api_key()
@@ -24,26 +87,59 @@ class EbayService:
             self.base_url = "https://svcs.ebay.com/services/search/FindingService/v1"
             logger.info("Using eBay Production API")
         
+        # Test keys never change for an instance, so decide once whether searches return mock data
+        self._is_test = self._is_using_test_keys()
+        
+        # Constant Finding API parameters; search_items only adds the keywords and page size
+        self._params_template = {
+            'OPERATION-NAME': 'findItemsByKeywords',
+            'SERVICE-VERSION': '1.0.0',
+            'SECURITY-APPNAME': self.app_id,
+            'RESPONSE-DATA-FORMAT': 'JSON',
+            'REST-PAYLOAD': ''
+        }
+        
         # Request timeout and retry configuration
         self.timeout = 15
         self.max_retries = 3
         self.retry_delay = 1
+        
+        # Timeouts, connection errors, 429s and 5xx responses are retried by urllib3 with jittered
+        # exponential backoff so concurrent searches don't retry in lockstep when eBay degrades;
+        # an explicit Retry-After is honoured up to the same cap. max_retries counts attempts,
+        # Retry counts retries
+        retry = _CappedRetry(
+            total=self.max_retries - 1,
+            backoff_factor=self.retry_delay,
+            backoff_jitter=0.5,
+            backoff_max=RETRY_BACKOFF_MAX,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({'GET'}),
+            respect_retry_after_header=True,
+            raise_on_status=False  # hand back the last 429/5xx response instead of raising
+        )
+        
+        # Persistent session so repeated searches reuse pooled keep-alive connections
+        # instead of paying a TCP+TLS handshake per call
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(pool_connections=10, pool_maxsize=50, max_retries=retry))
+        self.session.headers.update({
+            'User-Agent': 'FlipLens/1.0 (Secure)',
+            'Accept': 'application/json',
+            'Accept-Encoding': 'gzip, deflate'
+        })
     
     def _validate_api_key(self) -> str:
         """Validate and return API key with enhanced security and error handling"""
-        try:
+        if _HAS_CONFIG_HELPERS:
             # Use the enhanced configuration method
-            from config.settings import Config
             app_id = Config.get_api_key('EBAY_API_KEY')
             
             if not app_id:
                 logger.error("eBay API key not configured")
                 raise ValueError("EBAY_API_KEY not configured")
             
-            # Additional security validation
-            from utils.security import ApiKeySecurity, SecurityValidator
-            
-            # Validate format
+            # Additional security validation: format
             if not SecurityValidator.validate_api_key_format(app_id):
                 logger.error("Invalid eBay API key format")
                 raise ValueError("Invalid eBay API key format")
@@ -51,15 +147,15 @@ class EbayService:
             # Validate strength
             is_strong, strength_msg = ApiKeySecurity.validate_api_key_strength(app_id)
             if not is_strong:
-                logger.warning(f"eBay API key strength issue: {strength_msg}")
+                logger.warning("eBay API key strength issue: %s", strength_msg)
             
             # Log successful configuration (without exposing the key)
             masked_key = ApiKeySecurity.mask_api_key(app_id)
-            logger.info(f"eBay API key configured successfully: {masked_key}")
+            logger.info("eBay API key configured successfully: %s", masked_key)
             
             return app_id
             
-        except ImportError:
+        else:
             # Fallback to direct environment variable access
             app_id = current_app.config.get('EBAY_API_KEY') or current_app.config.get('EBAY_APP_ID')
             
@@ -72,92 +168,93 @@ class EbayService:
                 logger.error("Invalid eBay API key format")
                 raise ValueError("Invalid eBay API key format")
             
-            logger.info(f"eBay API key configured (length: {len(app_id)})")
+            logger.info("eBay API key configured (length: %s)", len(app_id))
             return app_id
     
     def _make_request(self, params: Dict[str, Any]) -> Dict[str, Any]:
-        """Make HTTP request with retry logic and enhanced security measures"""
-        for attempt in range(self.max_retries):
+        """Make HTTP request with enhanced security measures; retries happen in the session's adapter"""
+        if not ebay_breaker.allow_request():
+            logger.warning("eBay API circuit breaker open; failing fast")
+            return {"error": "eBay API unavailable", "message": "eBay service temporarily unavailable"}
+        
+        if not ebay_quota.try_acquire():
+            # Nothing is sent, so a half-open trial must not stay claimed
+            ebay_breaker.release()
+            logger.warning("eBay API call quota exhausted; failing fast")
+            return {"error": "Rate limit exceeded", "message": "Too many requests to eBay API"}
+        
+        try:
+            logger.debug("Making eBay API request")
+            
             try:
-                logger.debug(f"Making eBay API request (attempt {attempt + 1}/{self.max_retries})")
-                
-                # Enhanced request headers with security considerations
-                headers = {
-                    'User-Agent': 'FlipLens/1.0 (Secure)',
-                    'Accept': 'application/json',
-                    'Accept-Encoding': 'gzip, deflate',
-                    'Connection': 'close'  # Prevent connection reuse for sensitive requests
-                }
-                
-                response = requests.get(
+                response = self.session.get(
                     self.base_url,
                     params=params,
                     timeout=self.timeout,
-                    headers=headers,
                     allow_redirects=False  # Prevent redirect attacks
                 )
-                
-                # Log response status (without sensitive data)
-                logger.debug(f"eBay API response status: {response.status_code}")
-                
-                # Handle different HTTP status codes with enhanced security
-                if response.status_code == 200:
-                    return response.json()
-                elif response.status_code == 401:
-                    logger.error("eBay API authentication failed - check API key")
-                    return {"error": "Authentication failed", "message": "Invalid API key"}
-                elif response.status_code == 429:
-                    logger.warning("eBay API rate limit exceeded")
-                    return {"error": "Rate limit exceeded", "message": "Too many requests to eBay API"}
-                elif response.status_code >= 500:
-                    logger.error(f"eBay API server error: {response.status_code}")
-                    if attempt < self.max_retries - 1:
-                        time.sleep(self.retry_delay * (2 ** attempt))
-                        continue
-                    return {"error": "eBay API server error", "message": "eBay service temporarily unavailable"}
-                else:
-                    logger.error(f"eBay API error: {response.status_code}")
-                    return {"error": "eBay API error", "message": f"HTTP {response.status_code}"}
-                
-            except requests.exceptions.Timeout:
-                logger.warning(f"eBay API timeout (attempt {attempt + 1})")
-                if attempt < self.max_retries - 1:
-                    time.sleep(self.retry_delay * (2 ** attempt))
-                    continue
+            except Exception:
+                # Timeouts and connection errors (after retries) count against the breaker
+                ebay_breaker.record_failure()
+                raise
+            
+            # Only 5xx responses count as failures; a 4xx still means eBay is up and answering
+            if response.status_code >= 500:
+                ebay_breaker.record_failure()
+            else:
+                ebay_breaker.record_success()
+            
+            # Log response status (without sensitive data)
+            logger.debug("eBay API response status: %s", response.status_code)
+            
+            # Handle different HTTP status codes with enhanced security
+            if response.status_code == 200:
+                # Decode the (already decompressed) body bytes with orjson rather than stdlib json
+                return orjson.loads(response.content)
+            elif response.status_code == 401:
+                logger.error("eBay API authentication failed - check API key")
+                return {"error": "Authentication failed", "message": "Invalid API key"}
+            elif response.status_code == 429:
+                logger.warning("eBay API rate limit exceeded")
+                # eBay is already refusing us; stop spending calls until the bucket refills
+                ebay_quota.drain()
+                return {"error": "Rate limit exceeded", "message": "Too many requests to eBay API"}
+            elif response.status_code >= 500:
+                logger.error("eBay API server error: %s", response.status_code)
+                return {"error": "eBay API server error", "message": "eBay service temporarily unavailable"}
+            else:
+                logger.error("eBay API error: %s", response.status_code)
+                return {"error": "eBay API error", "message": f"HTTP {response.status_code}"}
+            
+        except requests.exceptions.Timeout:
+            logger.warning("eBay API timeout")
+            return {"error": "Timeout", "message": "eBay API request timed out"}
+            
+        except requests.exceptions.ConnectionError as e:
+            # Read timeouts that exhaust the retries surface as a ConnectionError wrapping MaxRetryError
+            reason = getattr(e.args[0], 'reason', None) if e.args else None
+            if isinstance(reason, ReadTimeoutError):
+                logger.warning("eBay API timeout")
                 return {"error": "Timeout", "message": "eBay API request timed out"}
-                
-            except requests.exceptions.ConnectionError:
-                logger.error(f"eBay API connection error (attempt {attempt + 1})")
-                if attempt < self.max_retries - 1:
-                    time.sleep(self.retry_delay * (2 ** attempt))
-                    continue
-                return {"error": "Connection error", "message": "Unable to connect to eBay API"}
-                
-            except requests.exceptions.RequestException as e:
-                logger.error(f"eBay API request error: {str(e)}")
-                return {"error": "Request error", "message": str(e)}
-                
-            except Exception as e:
-                logger.error(f"Unexpected error in eBay API request: {str(e)}")
-                return {"error": "Unexpected error", "message": "An unexpected error occurred"}
-        
-        return {"error": "Max retries exceeded", "message": "Failed after maximum retry attempts"}
+            logger.error("eBay API connection error")
+            return {"error": "Connection error", "message": "Unable to connect to eBay API"}
+            
+        except requests.exceptions.RequestException as e:
+            logger.error("eBay API request error: %s", e)
+            return {"error": "Request error", "message": str(e)}
+            
+        except Exception as e:
+            logger.error("Unexpected error in eBay API request: %s", e)
+            return {"error": "Unexpected error", "message": "An unexpected error occurred"}
     
     def _sanitize_query(self, query: str) -> str:
         """Sanitize search query to prevent injection attacks"""
         if not isinstance(query, str):
             return ""
         
-        # Remove potentially dangerous characters
-        dangerous_chars = ['<', '>', '"', "'", '&', ';', '|', '`', '$', '(', ')', '{', '}']
-        for char in dangerous_chars:
-            query = query.replace(char, '')
-        
-        # Limit query length
-        if len(query) > 100:
-            query = query[:100]
-        
-        return query.strip()
+        # Limit query length first so translate never scans more than 100 characters,
+        # then remove potentially dangerous characters
+        return query[:100].translate(self.SANITIZE_TABLE).strip()
     
     def _validate_limit(self, limit: Any) -> int:
         """Validate and sanitize limit parameter"""
@@ -196,18 +293,14 @@ class EbayService:
             validated_limit = self._validate_limit(limit)
 
             # Check if using test keys and return mock data
-            if self._is_using_test_keys():
+            if self._is_test:
                 return self._get_mock_search_results(sanitized_query, validated_limit)
 
-            logger.info(f"Searching eBay for: '{sanitized_query}' (limit: {validated_limit})")
+            logger.info("Searching eBay for: '%s' (limit: %s)", sanitized_query, validated_limit)
             
             # Prepare API request parameters
             params = {
-                'OPERATION-NAME': 'findItemsByKeywords',
-                'SERVICE-VERSION': '1.0.0',
-                'SECURITY-APPNAME': self.app_id,
-                'RESPONSE-DATA-FORMAT': 'JSON',
-                'REST-PAYLOAD': '',
+                **self._params_template,
                 'keywords': sanitized_query,
                 'paginationInput.entriesPerPage': validated_limit
             }
@@ -217,7 +310,7 @@ class EbayService:
             
             # Check for API errors
             if 'error' in response_data:
-                logger.error(f"eBay API error: {response_data['error']}")
+                logger.error("eBay API error: %s", response_data['error'])
                 return response_data
             
             # Parse and validate response
@@ -243,10 +336,10 @@ class EbayService:
                         if processed_item:
                             results.append(processed_item)
                     except Exception as e:
-                        logger.warning(f"Error processing item: {str(e)}")
+                        logger.warning("Error processing item: %s", e)
                         continue
                 
-                logger.info(f"Search completed successfully. Found {len(results)} items")
+                logger.info("Search completed successfully. Found %s items", len(results))
                 
                 # Enhance results with profit calculations and confidence scores
                 enhanced_results = self._enhance_results_with_analysis(results)
@@ -259,56 +352,50 @@ class EbayService:
                 }
                 
             except Exception as e:
-                logger.error(f"Error parsing eBay API response: {str(e)}")
+                logger.error("Error parsing eBay API response: %s", e)
                 return {"error": "Response parsing error", "message": "Failed to parse eBay API response"}
                 
         except Exception as e:
-            logger.error(f"Unexpected error in search_items: {str(e)}", exc_info=True)
+            logger.error("Unexpected error in search_items: %s", e, exc_info=True)
             return {"error": "Unexpected error", "message": "An unexpected error occurred"}
     
     def _process_item(self, item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Process and sanitize a single eBay item, including confidence score"""
         try:
-            # Extract and validate item data
-            title = self._extract_safe_string(item.get('title', ['']))
-            item_id = self._extract_safe_string(item.get('itemId', ['']))
-            view_item_url = self._extract_safe_string(item.get('viewItemURL', ['']))
-            gallery_url = self._extract_safe_string(item.get('galleryURL', ['']))
+            extract = _extract_safe_string
+            
+            # Validate required fields before extracting anything else
+            title = extract(item.get('title'))
+            item_id = extract(item.get('itemId'))
+            if not title or not item_id:
+                return None
+            
+            view_item_url = extract(item.get('viewItemURL'))
+            gallery_url = extract(item.get('galleryURL'))
             
             # Extract price information
-            selling_status = item.get('sellingStatus', [{}])
-            current_price = selling_status[0].get('currentPrice', [{}]) if selling_status else [{}]
-            price = self._extract_safe_string(current_price[0].get('__value__', '')) if current_price else ''
-            currency = self._extract_safe_string(current_price[0].get('@currencyId', '')) if current_price else ''
+            selling_status = item.get('sellingStatus')
+            current_price = selling_status[0].get('currentPrice') if selling_status else None
+            price_info = current_price[0] if current_price else {}
+            price = extract(price_info.get('__value__'))
+            currency = extract(price_info.get('@currencyId'))
             
             # Extract other fields
-            location = self._extract_safe_string(item.get('location', ['']))
-            condition = self._extract_safe_string(item.get('condition', [{}])[0].get('conditionDisplayName', ['']) if item.get('condition') else [''])
-            
-            # Validate required fields
-            if not title or not item_id:
-                return None
+            location = extract(item.get('location'))
+            condition_info = item.get('condition')
+            condition = extract(condition_info[0].get('conditionDisplayName')) if condition_info else ''
 
             # --- Confidence Score Calculation ---
-            score = 0.0
-            total = 6  # title, item_id, view_item_url, gallery_url, price+currency, location, condition
-            present = 0
-            if title: present += 1
-            if item_id: present += 1
-            if view_item_url: present += 1
-            if gallery_url: present += 1
+            # title and item_id are always present here; the remaining fields each add one point
+            present = 2 + bool(view_item_url) + bool(gallery_url) + bool(location) + bool(condition)
             if price and currency:
                 try:
-                    price_val = float(price)
-                    if 1 <= price_val <= 10000:
+                    if 1 <= float(price) <= 10000:
                         present += 1
-                except Exception:
+                except ValueError:
                     pass
-            if location: present += 1
-            if condition: present += 1
-            score = present / total
-            # Clamp between 0 and 1
-            score = max(0.0, min(1.0, score))
+            # 6 possible points (title, item_id, view_item_url, gallery_url, price+currency, location, condition), clamped to 1
+            score = min(1.0, present / 6)
             # --- End Confidence Score ---
 
             return {
@@ -324,23 +411,12 @@ class EbayService:
             }
             
         except Exception as e:
-            logger.warning(f"Error processing item data: {str(e)}")
+            logger.warning("Error processing item data: %s", e)
             return None
     
     def _extract_safe_string(self, value: Any) -> str:
         """Extract and sanitize string value from eBay response"""
-        if isinstance(value, list):
-            value = value[0] if value else ''
-        
-        if not isinstance(value, str):
-            return ''
-        
-        # Basic sanitization
-        value = value.strip()
-        if len(value) > 500:  # Limit length
-            value = value[:500]
-        
-        return value
+        return _extract_safe_string(value)
 
     def _enhance_results_with_analysis(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Enhance search results with profit calculations and market analysis"""
@@ -348,17 +424,11 @@ class EbayService:
             if not results:
                 return results
 
-            enhanced_results = []
+            # Parse each item's price once (None when unparseable) for both the statistics and the per-item math
+            item_prices = [_parse_price(item.get('price', 0)) for item in results]
 
             # Calculate market statistics for the entire result set
-            prices = []
-            for item in results:
-                try:
-                    price = float(item.get('price', 0))
-                    if price > 0:
-                        prices.append(price)
-                except (ValueError, TypeError):
-                    continue
+            prices = [price for price in item_prices if price is not None and price > 0]
 
             if not prices:
                 return results
@@ -368,36 +438,30 @@ class EbayService:
             min_price = min(prices)
             max_price = max(prices)
 
-            # Enhance each item
-            for item in results:
-                enhanced_item = item.copy()
-
+            # Enhance each item in place; they were freshly built by _process_item and aren't shared
+            total_results = len(results)
+            for item, price in zip(results, item_prices):
                 try:
-                    # Calculate profit estimates
-                    profit_data = self._calculate_profit_estimates(item, avg_price, min_price, max_price)
-                    enhanced_item.update(profit_data)
+                    # Update confidence score with market data (from the pre-enhancement fields)
+                    confidence = self._calculate_enhanced_confidence(item, total_results, avg_price, price)
 
-                    # Update confidence score with market data
-                    enhanced_item['confidence'] = self._calculate_enhanced_confidence(
-                        item, len(results), avg_price
-                    )
+                    # Calculate profit estimates
+                    item.update(self._calculate_profit_estimates(price, avg_price, min_price, max_price))
+                    item['confidence'] = confidence
 
                 except Exception as e:
-                    logger.warning(f"Error enhancing item {item.get('itemId', 'unknown')}: {str(e)}")
+                    logger.warning("Error enhancing item %s: %s", item.get('itemId', 'unknown'), e)
 
-                enhanced_results.append(enhanced_item)
-
-            return enhanced_results
+            return results
 
         except Exception as e:
-            logger.error(f"Error enhancing results: {str(e)}")
+            logger.error("Error enhancing results: %s", e)
             return results
 
-    def _calculate_profit_estimates(self, item: Dict[str, Any], avg_price: float, min_price: float, max_price: float) -> Dict[str, Any]:
-        """Calculate profit estimates for an item"""
+    def _calculate_profit_estimates(self, current_price: Optional[float], avg_price: float, min_price: float, max_price: float) -> Dict[str, Any]:
+        """Calculate profit estimates for an item from its parsed price (None if unparseable)"""
         try:
-            current_price = float(item.get('price', 0))
-            if current_price <= 0:
+            if current_price is None or current_price <= 0:
                 return {
                     'estimated_profit': 0,
                     'profit_margin': 0,
@@ -445,15 +509,15 @@ class EbayService:
             }
 
         except Exception as e:
-            logger.warning(f"Error calculating profit estimates: {str(e)}")
+            logger.warning("Error calculating profit estimates: %s", e)
             return {
                 'estimated_profit': 0,
                 'profit_margin': 0,
                 'market_position': 'unknown'
             }
 
-    def _calculate_enhanced_confidence(self, item: Dict[str, Any], total_results: int, avg_price: float) -> float:
-        """Calculate enhanced confidence score with market data"""
+    def _calculate_enhanced_confidence(self, item: Dict[str, Any], total_results: int, avg_price: float, price: Optional[float]) -> float:
+        """Calculate enhanced confidence score with market data, given the item's parsed price"""
         try:
             base_confidence = item.get('confidence', 0.5)
 
@@ -467,25 +531,22 @@ class EbayService:
                 confidence_factors.append(0.05)  # Moderate market data
 
             # Price reasonableness
-            try:
-                price = float(item.get('price', 0))
-                if price > 0 and avg_price > 0:
-                    price_ratio = price / avg_price
-                    if 0.5 <= price_ratio <= 2.0:  # Price within reasonable range
-                        confidence_factors.append(0.1)
-            except (ValueError, TypeError):
-                pass
+            if price is not None and price > 0 and avg_price > 0:
+                price_ratio = price / avg_price
+                if 0.5 <= price_ratio <= 2.0:  # Price within reasonable range
+                    confidence_factors.append(0.1)
 
             # Item condition
             condition = item.get('condition', '').lower()
-            if condition in ['new', 'new with tags', 'new without tags']:
+            if condition in self.NEW_CONDITIONS:
                 confidence_factors.append(0.1)
-            elif condition in ['excellent', 'very good', 'good']:
+            elif condition in self.GOOD_CONDITIONS:
                 confidence_factors.append(0.05)
 
             # Location (US items generally more reliable)
             location = item.get('location', '').lower()
-            if 'united states' in location or 'usa' in location or 'us' in location:
+            # ('usa' needs no check of its own: any location containing it also contains 'us')
+            if 'us' in location or 'united states' in location:
                 confidence_factors.append(0.05)
 
             # Calculate final confidence
@@ -495,7 +556,7 @@ class EbayService:
             return min(enhanced_confidence, 1.0)
 
         except Exception as e:
-            logger.warning(f"Error calculating enhanced confidence: {str(e)}")
+            logger.warning("Error calculating enhanced confidence: %s", e)
             return item.get('confidence', 0.5)
 
     def _is_using_test_keys(self) -> bool:
@@ -511,24 +572,26 @@ class EbayService:
 
     def _get_mock_search_results(self, query: str, limit: int) -> Dict[str, Any]:
         """Return mock search results for testing"""
-        logger.info(f"Returning mock search results for query: '{query}'")
+        logger.info("Returning mock search results for query: '%s'", query)
 
-        # Generate mock items based on query
+        # Generate mock items based on query; crc32 (unlike the salted hash()) gives the same
+        # item IDs and prices for a query in every worker process
+        query_hash = zlib.crc32(query.encode('utf-8'))
         mock_items = []
         for i in range(min(limit, 5)):  # Return up to 5 mock items
             item = {
                 'title': f'{query} - Mock Item {i+1}',
-                'itemId': f'mock-{i+1}-{hash(query) % 10000}',
+                'itemId': f'mock-{i+1}-{query_hash % 10000}',
                 'viewItemURL': f'https://ebay.com/item/mock-{i+1}',
                 'galleryURL': 'https://via.placeholder.com/150x150?text=Mock+Item',
-                'price': round(50 + (i * 25) + (hash(query) % 100), 2),
+                'price': round(50 + (i * 25) + (query_hash % 100), 2),
                 'currency': 'USD',
                 'location': 'United States',
-                'condition': ['New', 'Used', 'Excellent', 'Good'][i % 4],
+                'condition': self.MOCK_CONDITIONS[i % 4],
                 'confidence': 0.8 + (i * 0.05),
                 'estimated_profit': round(20 + (i * 10), 2),
                 'profit_margin': round(25 + (i * 5), 1),
-                'market_position': ['low', 'average', 'moderate', 'high'][i % 4],
+                'market_position': self.MOCK_MARKET_POSITIONS[i % 4],
                 'platform_fees': round(8 + (i * 2), 2),
                 'estimated_purchase_price': round(30 + (i * 15), 2)
             }
@@ -105,10 +105,15 @@ class TestSecurityValidator(unittest.TestCase):
 class TestEbayServiceSecurity(unittest.TestCase):
     """Test eBay service security features"""
     
-    def setUp(self):
-        with patch('flask.current_app'):
+    @classmethod
+    def setUpClass(cls):
+        # The tests only call pure helper methods, so one service instance serves them all.
+        # The service reads app config and the API key, so build it in a bare app context
+        from flask import Flask
+        with Flask(__name__).app_context(), \
+                patch.dict(os.environ, {'EBAY_API_KEY': 'TestApp-1234567890abcdef-PRD-abcdef'}):
             from services.ebay_service import EbayService
-            self.service = EbayService()
+            cls.service = EbayService()
     
     def test_sanitize_query(self):
         """Test query sanitization in eBay service"""
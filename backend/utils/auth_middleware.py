@@ -9,8 +9,15 @@ import logging
 
 logger = logging.getLogger(__name__)
 
-def auth_required(f):
-    """Decorator to require authentication for routes"""
+def auth_required(f=None, *, load_options=()):
+    """Decorator to require authentication for routes
+
+    Use as @auth_required, or as @auth_required(load_options=...) to load the user with extra
+    loader options, e.g. joinedload of a relationship the route reads.
+    """
+    if f is None:
+        return lambda f: auth_required(f, load_options=load_options)
+    
     @wraps(f)
     def decorated_function(*args, **kwargs):
         try:
@@ -28,7 +35,7 @@ def auth_required(f):
             token = auth_header.split(' ')[1]
             
             # Verify token and get user
-            user = User.verify_jwt_token(token)
+            user = User.verify_jwt_token(token, load_options)
             
             if not user:
                 return jsonify({
@@ -46,11 +53,6 @@ def auth_required(f):
                     "code": "ACCOUNT_DISABLED"
                 }), 403
             
-            # Store user in Flask's g object for use in the route
-            g.current_user = user
-            
-            return f(*args, **kwargs)
-            
         except Exception as e:
             logger.error(f"Authentication error: {str(e)}", exc_info=True)
             return jsonify({
@@ -59,6 +61,12 @@ def auth_required(f):
                 "status": "error",
                 "code": "AUTHENTICATION_ERROR"
             }), 500
+        
+        # Store user in Flask's g object for use in the route
+        g.current_user = user
+        
+        # Outside the try so errors raised by the route reach the blueprint's error handler
+        return f(*args, **kwargs)
     
     return decorated_function
 
@@ -83,13 +91,13 @@ def auth_optional(f):
             else:
                 g.current_user = None
             
-            return f(*args, **kwargs)
-            
         except Exception as e:
             logger.error(f"Optional authentication error: {str(e)}", exc_info=True)
             # For optional auth, we don't fail the request
             g.current_user = None
-            return f(*args, **kwargs)
+        
+        # Outside the try so a failing route is neither run twice nor masked
+        return f(*args, **kwargs)
     
     return decorated_function
 
@@ -0,0 +1,52 @@
+"""
+In-memory caching utilities for FlipLens application
+"""
+
+from cachetools import TLRUCache
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+class Cache:
+    """Simple thread-safe in-memory cache with a per-key TTL"""
+
+    def __init__(self, maxsize=10_000):
+        # Entries are stored as (ttl, value) so each key can expire on its own schedule
+        self._store = TLRUCache(maxsize=maxsize, ttu=lambda _key, entry, now: now + entry[0])
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """Get a cached value, or default if missing or expired"""
+        with self._lock:
+            entry = self._store.get(key)
+        return entry[1] if entry is not None else default
+
+    def set(self, key, value, ttl):
+        """Cache a value for ttl seconds"""
+        with self._lock:
+            self._store[key] = (ttl, value)
+
+    def get_or_set(self, key, ttl, compute_fn):
+        """Return the cached value for key, computing and caching it on a miss"""
+        with self._lock:
+            entry = self._store.get(key)
+        if entry is not None:
+            return entry[1]
+
+        value = compute_fn()
+        self.set(key, value, ttl)
+        return value
+
+    def delete(self, key):
+        """Remove a key from the cache"""
+        with self._lock:
+            self._store.pop(key, None)
+
+    def clear(self):
+        """Remove all cached entries"""
+        with self._lock:
+            self._store.clear()
+
+# Global cache instance
+cache = Cache()
@@ -0,0 +1,62 @@
+"""
+Circuit breaker utilities for FlipLens application
+"""
+
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+class CircuitBreaker:
+    """Simple thread-safe circuit breaker for calls to an external service
+
+    After fail_max consecutive failures the circuit opens and requests are refused
+    for reset_timeout seconds; then a single trial request is let through, which
+    closes the circuit on success or reopens it on failure.
+    """
+
+    def __init__(self, name, fail_max=5, reset_timeout=60):
+        self.name = name
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow_request(self):
+        """Check whether a request may be sent to the service right now"""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+
+            # Half-open: once the timeout has passed, let exactly one trial request through
+            if not self._trial_in_flight and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self._trial_in_flight = True
+                return True
+
+            return False
+
+    def release(self):
+        """Give back a request allowed by allow_request that was never sent, freeing a half-open trial"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_success(self):
+        """Record a successful call, closing the circuit"""
+        with self._lock:
+            if self._opened_at is not None:
+                logger.info("Circuit breaker '%s' closed", self.name)
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        """Record a failed call, opening the circuit after fail_max consecutive failures"""
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or (self._opened_at is None and self._failures >= self.fail_max):
+                logger.warning("Circuit breaker '%s' opened after %s consecutive failures", self.name, self._failures)
+                self._opened_at = time.monotonic()
+            self._trial_in_flight = False
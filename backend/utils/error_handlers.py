@@ -1,8 +1,16 @@
 from flask import jsonify, request
+from werkzeug.exceptions import HTTPException
+from models.database import db
+from utils.responses import StaticErrorResponses
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Canonical 500 body, serialized once at import time
+_error_response = StaticErrorResponses(
+    (500, {"error": "Internal Server Error", "message": "An unexpected error occurred.", "status": "error", "code": "INTERNAL_SERVER_ERROR"})
+)
+
 def register_error_handlers(app):
     """Register error handlers for the Flask application"""
     
@@ -93,11 +101,7 @@ def register_error_handlers(app):
     def internal_error(error):
         """Handle 500 Internal Server Error"""
         logger.error(f"Internal server error: {str(error)}", exc_info=True)
-        return jsonify({
-            "error": "Internal Server Error",
-            "message": "An unexpected error occurred",
-            "status": "error"
-        }), 500
+        return _error_response('INTERNAL_SERVER_ERROR')
     
     @app.errorhandler(502)
     def bad_gateway(error):
@@ -133,9 +137,10 @@ def register_error_handlers(app):
     @app.errorhandler(Exception)
     def handle_exception(error):
         """Handle unhandled exceptions"""
-        logger.error(f"Unhandled exception: {str(error)}", exc_info=True)
-        return jsonify({
-            "error": "Internal Server Error",
-            "message": "An unexpected error occurred",
-            "status": "error"
-        }), 500 
\ No newline at end of file
+        # 404/405/etc. raised by Flask or abort() keep their own status
+        if isinstance(error, HTTPException):
+            return error
+        
+        logger.error(f"Unhandled exception in {request.endpoint}: {str(error)}", exc_info=True)
+        db.session.rollback()
+        return _error_response('INTERNAL_SERVER_ERROR') 
\ No newline at end of file
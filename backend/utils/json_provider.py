@@ -0,0 +1,66 @@
+"""
+JSON provider for FlipLens application backed by orjson
+"""
+
+from flask import stream_with_context
+from flask.json.provider import DefaultJSONProvider
+import orjson
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider that serializes with orjson instead of the stdlib json module"""
+
+    def dumps_bytes(self, obj):
+        """Serialize an object to JSON bytes, e.g. for streamed response bodies"""
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+
+        # Fall back to Flask's default() for types orjson doesn't handle (Decimal, __html__)
+        return orjson.dumps(obj, default=self.default, option=option)
+
+    def dumps(self, obj, **kwargs):
+        """Serialize data as JSON string"""
+        return self.dumps_bytes(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        """Deserialize JSON from a string or bytes, e.g. request bodies via request.get_json()"""
+        # orjson takes no options; keep the stdlib path for callers that pass any
+        if kwargs:
+            return super().loads(s, **kwargs)
+        # orjson.JSONDecodeError subclasses ValueError, so Werkzeug's bad-JSON handling still applies
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        """Serialize the given arguments as JSON and return a response without an extra decode step"""
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.dumps_bytes(obj), mimetype=self.mimetype)
+
+    def stream_response(self, obj, stream_key, items, to_dict=None, *, to_json=None):
+        """Return a response that streams obj as JSON, emitting obj[stream_key] one item at a time
+
+        Items are converted with to_dict, or with to_json when they can supply their own JSON bytes.
+        """
+        encode_item = to_json or (lambda item: self.dumps_bytes(to_dict(item)))
+        # Keep the request context (and DB session) alive while ORM items are serialized
+        body = stream_with_context(self._iter_object(obj, stream_key, items, encode_item))
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+    def _iter_object(self, obj, stream_key, items, encode_item):
+        """Yield the JSON encoding of obj in chunks, with items serialized lazily under stream_key"""
+        keys = sorted(set(obj) | {stream_key}) if self.sort_keys else [*obj, stream_key]
+        yield b'{'
+        for index, key in enumerate(keys):
+            if index:
+                yield b','
+            yield self.dumps_bytes(key) + b':'
+            if key != stream_key:
+                yield self.dumps_bytes(obj[key])
+                continue
+
+            yield b'['
+            for item_index, item in enumerate(items):
+                if item_index:
+                    yield b','
+                yield encode_item(item)
+            yield b']'
+        yield b'}'
@@ -0,0 +1,25 @@
+"""
+Keyset pagination helpers for FlipLens application
+"""
+
+import base64
+import binascii
+from datetime import datetime
+
+def encode_cursor(created_at, item_id):
+    """Encode a (created_at, id) position as an opaque URL-safe cursor"""
+    raw = f"{created_at.isoformat()}|{item_id}"
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+def decode_cursor(cursor):
+    """Decode a cursor back into (created_at, id); raises ValueError if malformed"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8')
+    except (binascii.Error, UnicodeError) as e:
+        raise ValueError("Malformed pagination cursor") from e
+
+    created_at, sep, item_id = raw.rpartition('|')
+    if not sep:
+        raise ValueError("Malformed pagination cursor")
+
+    return datetime.fromisoformat(created_at), int(item_id)
@@ -0,0 +1,39 @@
+"""
+Password hashing utilities for FlipLens application
+"""
+
+from argon2 import PasswordHasher
+from argon2.exceptions import VerificationError, InvalidHashError
+from werkzeug.security import check_password_hash
+import logging
+
+logger = logging.getLogger(__name__)
+
+ARGON2_PREFIX = '$argon2'
+
+# Argon2id with a 64 MiB memory cost
+password_hasher = PasswordHasher(time_cost=2, memory_cost=65536, parallelism=1)
+
+def hash_password(password):
+    """Hash a password with Argon2id"""
+    return password_hasher.hash(password)
+
+def verify_password(password_hash, password):
+    """Check a password against an Argon2id or legacy werkzeug hash"""
+    if not password_hash:
+        return False
+
+    # Accounts created before the Argon2 switch still carry werkzeug pbkdf2/scrypt hashes
+    if not password_hash.startswith(ARGON2_PREFIX):
+        return check_password_hash(password_hash, password)
+
+    try:
+        return password_hasher.verify(password_hash, password)
+    except (VerificationError, InvalidHashError):
+        return False
+
+def needs_rehash(password_hash):
+    """Check whether a stored hash should be upgraded to the current Argon2 parameters"""
+    if not password_hash or not password_hash.startswith(ARGON2_PREFIX):
+        return True
+    return password_hasher.check_needs_rehash(password_hash)
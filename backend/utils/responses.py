@@ -0,0 +1,32 @@
+"""
+Prebuilt JSON responses for FlipLens application
+"""
+
+from flask import current_app
+import orjson
+
+class StaticErrorResponses:
+    """Constant error payloads serialized once at import time and looked up by their code"""
+
+    def __init__(self, *errors):
+        # errors are (http_status, payload) pairs; keys are sorted to match jsonify output
+        self._bodies = {
+            payload['code']: (orjson.dumps(payload, option=orjson.OPT_SORT_KEYS), http_status)
+            for http_status, payload in errors
+        }
+
+    def __call__(self, code):
+        """Build a fresh (response, status) pair for the error registered under code"""
+        body, http_status = self._bodies[code]
+        return current_app.response_class(body, mimetype='application/json'), http_status
+
+class StaticResponse:
+    """Constant success payload serialized once at import time"""
+
+    def __init__(self, payload, http_status=200):
+        self._body = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+        self._http_status = http_status
+
+    def __call__(self):
+        """Build a fresh (response, status) pair around the prebuilt body"""
+        return current_app.response_class(self._body, mimetype='application/json'), self._http_status
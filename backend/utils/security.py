@@ -73,6 +73,9 @@ class SecurityValidator:
         'api_key': r'^[A-Za-z0-9\-_\.]+$'  # API key format
     }
     
+    # Characters stripped by sanitize_string
+    SANITIZE_TABLE = str.maketrans('', '', '<>"\'')
+    
     @classmethod
     def validate_string(cls, value: str, pattern: str, max_length: int = 100) -> bool:
         """Validate a string against a pattern and length limit"""
@@ -97,7 +100,7 @@ class SecurityValidator:
         value = html.escape(value)
         
         # Remove potentially dangerous characters
-        value = re.sub(r'[<>"\']', '', value)
+        value = value.translate(cls.SANITIZE_TABLE)
         
         # URL decode to prevent double encoding attacks
         try:
@@ -0,0 +1,21 @@
+"""
+Timestamp formatting utilities for FlipLens application
+"""
+
+import time
+
+# (second, "YYYY-MM-DDTHH:MM:SS") for the most recent second formatted; replaced as one tuple so threads never see a torn pair
+_prefix_cache = (None, '')
+
+def iso_now():
+    """Current UTC time as an ISO 8601 string with microseconds, like datetime.utcnow().isoformat()"""
+    global _prefix_cache
+    seconds, micros = divmod(time.time_ns() // 1000, 1_000_000)
+
+    cached_seconds, prefix = _prefix_cache
+    if seconds != cached_seconds:
+        # Only the first call in each second pays for strftime
+        prefix = time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(seconds))
+        _prefix_cache = (seconds, prefix)
+
+    return f"{prefix}.{micros:06d}"
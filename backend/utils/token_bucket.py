@@ -0,0 +1,45 @@
+"""
+Token bucket utilities for FlipLens application
+"""
+
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+class TokenBucket:
+    """Simple thread-safe token bucket for client-side limits on calls to an external service
+
+    The bucket holds up to capacity tokens and refills at rate tokens per second; each call
+    takes one token and is refused while the bucket is empty.
+    """
+
+    def __init__(self, name, rate, capacity):
+        self.name = name
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def try_acquire(self):
+        """Take a token if one is available, returning whether the call may proceed"""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    def drain(self):
+        """Empty the bucket, e.g. when the service reports that its own limit was hit"""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= 1:
+                logger.warning("Token bucket '%s' drained", self.name)
+            self._tokens = 0.0
@@ -13,6 +13,9 @@ def validate_json_input(schema):
     Decorator to validate JSON input against a schema
     This is a simplified validation - in production you might want to use jsonschema
     """
+    # Resolve the schema once at decoration time rather than on every request
+    required_fields = tuple(schema.get('required', ()))
+    
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
@@ -36,15 +39,14 @@ def validate_json_input(schema):
                     }), 400
                 
                 # Basic validation - check required fields
-                if 'required' in schema:
-                    for field in schema['required']:
-                        if field not in data:
-                            return jsonify({
-                                "error": "Missing Required Field",
-                                "message": f"Field '{field}' is required",
-                                "status": "error",
-                                "code": "MISSING_FIELD"
-                            }), 400
+                for field in required_fields:
+                    if field not in data:
+                        return jsonify({
+                            "error": "Missing Required Field",
+                            "message": f"Field '{field}' is required",
+                            "status": "error",
+                            "code": "MISSING_FIELD"
+                        }), 400
                 
                 # Store validated data in g for use in the route
                 g.validated_json = data